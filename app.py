@@ -1,51 +1,187 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import (Blueprint, Flask, current_app, render_template, request, jsonify, redirect, url_for,
+                   send_from_directory, stream_with_context)
+import hashlib
 import json
+import mimetypes
 import os
-from datetime import datetime
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
 from models import db, Game, Category, Clue, Player, GameInstance
+from boards import (load_board, get_board_version, touch_game, parse_id,
+                    validate_board, validate_title, insert_board, BoardValidationError,
+                    claim_game_version, apply_board_diff, BoardConflictError,
+                    delete_games, delete_category_rows, list_game_page, count_rows, decode_cursor,
+                    game_list_version_query)
+from cache import board_cache, board_flight, stats_cache
+from export import iter_export_games, iter_ndjson, gzip_chunks, parse_updated_since, export_games_command
+from legacy_import import import_legacy_command
+from game_sessions import session_store, SessionError
+from push import broker, encode_event
+from guest_answers import answer_store
+from qr_codes import qr_cache, MIN_SIZE, MAX_SIZE, DEFAULT_SIZE
+from search import search_clues, SearchUnavailable, rebuild_search_index_command
+from assets import init_assets, precompressed, DIST_DIR, build_assets_command
+from encoding import (init_compression, accepted_encoding, board_format, board_body, put_board, pack_board,
+                      weaken_etag, BOARD_TYPES)
+from config import database_url_from_env, engine_options_from_env
+from metrics import pool_metrics, init_pool_metrics, request_metrics, init_request_metrics
+from sqlalchemy import text
+from werkzeug.http import parse_accept_header
 from sqlalchemy.exc import SQLAlchemyError
-from flask_migrate import Migrate
-from flask_cors import CORS
+import click
 # Guest feature removed for now
 # from remote_answers import init_socketio, generate_qr_code, create_game_session, register_guest, get_join_link, get_guest_qr_code, broadcast_clue, broadcast_answer_reveal, broadcast_game_over, get_guest_responses, get_guest_scores
 
-app = Flask(__name__)
-CORS(app)
+bp = Blueprint('main', __name__)
 
-# Configure database
-database_url = os.environ.get('DATABASE_URL', 'sqlite:///jeopardy.db')
+def create_app(test_config=None):
+    app = Flask(__name__)
+    
+    # Configure database
+    database_url = database_url_from_env()
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_env(database_url)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    # Opt-in per-request timing (Server-Timing header and /api/metrics histograms)
+    app.config['REQUEST_METRICS'] = os.environ.get('REQUEST_METRICS', 'False') == 'True'
+    
+    # Optional extensions; Flask-Migrate is only needed by the flask CLI (flask db ...)
+    app.config['CORS_ENABLED'] = os.environ.get('CORS_ENABLED', 'True') == 'True'
+    app.config['MIGRATIONS_ENABLED'] = click.get_current_context(silent=True) is not None
+    
+    # Add secret key for session management
+    app.secret_key = os.environ.get('SECRET_KEY', 'dev_key_for_graceful_jeopardy')
+    
+    if test_config:
+        app.config.update(test_config)
+    
+    # Initialize database. The schema is managed by migrations (flask db upgrade),
+    # so nothing here touches the database at startup.
+    db.init_app(app)
+    
+    if app.config['CORS_ENABLED']:
+        from flask_cors import CORS
+        CORS(app)
+    
+    if app.config['MIGRATIONS_ENABLED']:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    
+    # Initialize SocketIO - disabled for now
+    # init_socketio(app)
+    
+    session_store.init_app(app)
+    init_compression(app)
+    init_assets(app)
+    app.register_blueprint(bp)
+    app.cli.add_command(export_games_command)
+    app.cli.add_command(import_legacy_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(build_assets_command)
+    
+    with app.app_context():
+        init_pool_metrics(db.engine)
+        if app.config['REQUEST_METRICS']:
+            init_request_metrics(app, db.engine)
+    
+    return app
 
-# Fix for PostgreSQL URI format and specify psycopg3 driver
-if database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql+psycopg://', 1)
-elif database_url.startswith('postgresql://'):
-    database_url = database_url.replace('postgresql://', 'postgresql+psycopg://', 1)
+# Game list pagination limits
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Clue search pagination limits
+DEFAULT_SEARCH_SIZE = 20
+MAX_SEARCH_SIZE = 100
+
+# Conditional GET helpers
+def version_etag(kind, game_id, updated):
+    # Strong validator derived from Game.updated; changes on every board write
+    stamp = int(updated.timestamp() * 1000000) if updated else 0
+    return f'{kind}-{game_id}-{stamp}'
+
+def game_list_params(args):
+    # Validate and normalize the list query; raises ValueError with the client-facing message
+    try:
+        limit = min(int(args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError(f"Invalid limit: {args.get('limit')} - must be an integer")
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    
+    order = args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError(f'Invalid order: {order} - must be asc or desc')
     
-app.config['SQLALCHEMY_DATABASE_URI'] = database_url
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    cursor = args.get('cursor')
+    if cursor is not None:
+        decode_cursor(cursor)
+    return {'limit': limit, 'cursor': cursor, 'descending': order == 'desc', 'title_prefix': args.get('title') or None}
 
-# Add secret key for session management
-app.secret_key = os.environ.get('SECRET_KEY', 'dev_key_for_graceful_jeopardy')
+def game_list_etag(count, max_id, max_updated, params):
+    # Every page and filter is its own representation, so the normalized query is part of the validator
+    query = json.dumps([params['limit'], params['cursor'], params['descending'], params['title_prefix']])
+    digest = hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+    return version_etag(f'games-{count}-{digest}', max_id or 0, max_updated)
 
-# Initialize database
-db.init_app(app)
+def not_modified(etag, last_modified=None):
+    # Answer If-None-Match / If-Modified-Since before any body is built. The
+    # weak comparison also matches the weak ETags of compressed responses.
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        matched = last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    else:
+        matched = False
+    
+    if not matched:
+        return None
+    
+    return with_validators(current_app.response_class(status=304), etag, last_modified)
+
+def with_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Let browsers and proxies store the body but always revalidate it
+    response.cache_control.no_cache = True
+    return response
 
-# Initialize Flask-Migrate
-migrate = Migrate(app, db)
+def immutable(response):
+    # For content-addressed URLs: the bytes behind them never change, so skip revalidation
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response
 
-# Initialize SocketIO - disabled for now
-# init_socketio(app)
+def build_board(game_id, fmt):
+    # Load and encode a board into the board cache; returns (body, updated) or None if it is gone.
+    # The game, categories and clues are fetched up front instead of lazily per category.
+    game = load_board(game_id)
+    if game is None:
+        return None
+    
+    if fmt == 'msgpack':
+        plain = pack_board(game)
+    else:
+        plain = current_app.json.dumps(game.to_dict()).encode('utf-8')
+    board_cache.put(game_id, game.updated, plain, fmt)
+    return plain, game.updated
 
-# Create database tables if they don't exist (for development)
-with app.app_context():
-    db.create_all()
+def board_changed(game_id):
+    # Call after committing any write to a game's board
+    board_cache.invalidate(game_id)
+    stats_cache.invalidate()
 
-# Ensure data directory exists (for backwards compatibility)
-data_dir = os.path.join(os.path.dirname(__file__), 'data', 'games')
-os.makedirs(data_dir, exist_ok=True)
+def sessions_deleted(instance_ids):
+    # Call after committing the delete of sessions, so their live state 404s instead of writing to nothing
+    session_store.discard(instance_ids)
+    answer_store.discard(instance_ids)
 
 # Routes
-@app.route('/')
+@bp.route('/')
 def index():
     # Test database connection
     db_status = {
@@ -55,41 +191,60 @@ def index():
     }
     
     try:
-        # Try to query the database
-        game_count = Game.query.count()
-        db_status['game_count'] = game_count
+        # Counts come from the shared cache rather than a COUNT(*) per page view
+        counts, age = stats_cache.get(count_rows)
+        db_status['game_count'] = counts['game_count']
     except Exception as e:
         db_status['connected'] = False
         db_status['error'] = str(e)
     
     return render_template('index.html', db_status=db_status)
 
-@app.route('/creator')
+@bp.route('/creator')
 def creator():
     return render_template('creator.html')
 
-@app.route('/edit/<game_id>')
+@bp.route('/edit/<game_id>')
 def edit_game_route(game_id):
     return render_template('creator.html', edit_mode=True, game_id=game_id)
 
-@app.route('/game/<game_id>')
+@bp.route('/game/<game_id>')
 def game(game_id):
     return render_template('game.html', game_id=game_id)
 
 # API endpoints
-@app.route('/api/games', methods=['GET'])
+@bp.route('/api/games', methods=['GET'])
 def list_games():
     try:
-        games = Game.query.all()
-        return jsonify([{
+        params = game_list_params(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        count, max_id, max_updated = db.session.execute(game_list_version_query()).one()
+        etag = game_list_etag(count, max_id, max_updated, params)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        games, next_cursor = list_game_page(**params)
+        
+        response = jsonify([{
             'id': game.id,
             'title': game.title,
             'created': game.created.isoformat()
         } for game in games])
+        
+        # The body stays a plain list; the next page is advertised in a header
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+            response.headers['Link'] = '<{}>; rel="next"'.format(
+                url_for('main.list_games', _external=False, **dict(request.args.items(), cursor=next_cursor)))
+        return with_validators(response, etag)
     except SQLAlchemyError as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games', methods=['POST'])
+@bp.route('/api/games', methods=['POST'])
 def create_game():
     data = request.get_json()
     if not data or 'title' not in data:
@@ -99,6 +254,7 @@ def create_game():
         new_game = Game(title=data['title'])
         db.session.add(new_game)
         db.session.commit()
+        board_changed(new_game.id)
         
         return jsonify({
             'id': new_game.id,
@@ -109,63 +265,234 @@ def create_game():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>', methods=['GET'])
+@bp.route('/api/games/bulk', methods=['POST'])
+def create_game_bulk():
+    # Create a whole board (game, categories and clues) in one request and one commit
+    try:
+        board = validate_board(request.get_json(silent=True))
+    except BoardValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        game, created = insert_board(board)
+        db.session.commit()
+        board_changed(game.id)
+        
+        return jsonify({
+            'id': game.id,
+            'title': game.title,
+            'created': game.created.isoformat(),
+            'categories': [{
+                'id': str(category_id),
+                'clues': [str(clue_id) for clue_id in clue_ids]
+            } for category_id, clue_ids in created]
+        })
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/games/<game_id>', methods=['GET'])
 def get_game(game_id):
     try:
-        game = Game.query.get(game_id)
-        if game is None:
+        game_id_int = parse_id(game_id)
+        if game_id_int is None:
             return jsonify({'error': 'Game not found'}), 404
         
-        return jsonify(game.to_dict())
+        found, updated = get_board_version(game_id_int)
+        if not found:
+            return jsonify({'error': 'Game not found'}), 404
+        
+        fmt = board_format(request.headers.get('Accept'))
+        etag = version_etag('board' if fmt == 'json' else f'board-{fmt}', game_id_int, updated)
+        cached = not_modified(etag, updated)
+        if cached is not None:
+            return cached
+        
+        # Serve the pre-encoded (and pre-compressed) board if it was built from the current version
+        encoding = accepted_encoding(request.headers.get('Accept-Encoding'))
+        body, applied = board_body(game_id_int, updated, fmt, encoding)
+        if body is None:
+            # Concurrent misses for this board version wait on one load instead of each querying
+            built = board_flight.do((game_id_int, updated, fmt), lambda: build_board(game_id_int, fmt))
+            if built is None:
+                return jsonify({'error': 'Game not found'}), 404
+            
+            plain, built_updated = built
+            body, applied = put_board(game_id_int, built_updated, fmt, plain, encoding, cached=True)
+        
+        response = current_app.response_class(body, mimetype=BOARD_TYPES[fmt])
+        response.vary.update(('Accept', 'Accept-Encoding'))
+        with_validators(response, etag, updated)
+        if applied:
+            response.headers['Content-Encoding'] = applied
+            weaken_etag(response)
+        return response
     except SQLAlchemyError as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>', methods=['PUT'])
+@bp.route('/api/games/<game_id>', methods=['PUT', 'PATCH'])
 def update_game(game_id):
     data = request.get_json()
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
     try:
-        game = Game.query.get(game_id)
+        game = load_board(game_id)
         if game is None:
             return jsonify({'error': 'Game not found'}), 404
         
-        # Update title if provided
-        if 'title' in data:
-            game.title = data['title']
+        # A full board in the body is diffed against the stored categories and clues
+        board = None
+        title = None
+        try:
+            if 'categories' in data:
+                board = validate_board({
+                    'title': data.get('title', game.title),
+                    'categories': data['categories']
+                })
+            if 'title' in data:
+                title = validate_title(data['title'])
+        except BoardValidationError as e:
+            return jsonify({'error': str(e)}), 400
         
-        game.updated = datetime.now()
+        # Clients send back the 'updated' value they loaded; without it we
+        # still guard against a save that lands between our read and write
+        expected_updated = game.updated
+        if 'updated' in data:
+            try:
+                expected_updated = datetime.fromisoformat(data['updated']) if data['updated'] else None
+            except (TypeError, ValueError):
+                return jsonify({'error': f"Invalid updated timestamp: {data['updated']}"}), 400
+        
+        try:
+            claim_game_version(game.id, expected_updated, title)
+        except BoardConflictError as e:
+            db.session.rollback()
+            found, current = get_board_version(game.id)
+            return jsonify({
+                'error': str(e),
+                'updated': current.isoformat() if current else None
+            }), 409
+        
+        if board is not None:
+            apply_board_diff(game, board)
+        
+        game_id_int = game.id
         db.session.commit()
+        board_changed(game_id_int)
         
-        return jsonify(game.to_dict())
+        return jsonify(load_board(game_id_int).to_dict())
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>', methods=['DELETE'])
+@bp.route('/api/games/<game_id>', methods=['DELETE'])
 def delete_game(game_id):
     try:
-        game = Game.query.get(game_id)
-        if game is None:
-            return jsonify({'error': 'Game not found'}), 404
+        game_id_int = parse_id(game_id)
         
-        # Delete associated categories and clues
-        for category in game.categories:
-            for clue in category.clues:
-                db.session.delete(clue)
-            db.session.delete(category)
+        # Delete the game with its categories, clues and sessions in set-based statements
+        deleted, instance_ids = delete_games([game_id_int]) if game_id_int is not None else ([], [])
+        if not deleted:
+            db.session.rollback()
+            return jsonify({'error': 'Game not found'}), 404
         
-        # Delete the game
-        db.session.delete(game)
         db.session.commit()
+        board_changed(game_id_int)
+        sessions_deleted(instance_ids)
         
         return jsonify({'success': True, 'message': 'Game deleted successfully', 'id': game_id})
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>/categories', methods=['POST'])
+@bp.route('/api/games/batch-delete', methods=['POST'])
+def delete_games_batch():
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('ids'), list):
+        return jsonify({'error': 'A list of game ids is required'}), 400
+    
+    game_ids = [parse_id(game_id) for game_id in data['ids']]
+    if None in game_ids:
+        return jsonify({'error': 'Invalid ID format - game ids must be integers'}), 400
+    
+    try:
+        deleted, instance_ids = delete_games(game_ids)
+        db.session.commit()
+        
+        for game_id in deleted:
+            board_changed(game_id)
+        sessions_deleted(instance_ids)
+        
+        deleted_set = set(deleted)
+        return jsonify({
+            'success': True,
+            'deleted': deleted,
+            'not_found': [game_id for game_id in dict.fromkeys(game_ids) if game_id not in deleted_set]
+        })
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/games/export', methods=['GET'])
+def export_games():
+    # Stream every board as NDJSON; ?updated_since=<ISO timestamp> for incremental exports
+    try:
+        updated_since = parse_updated_since(request.args.get('updated_since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Errors after the first chunk can only truncate the stream, so consumers
+    # should treat a missing trailing newline as a failed export
+    body = iter_ndjson(iter_export_games(updated_since))
+    headers = {
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': 'no-store',
+        'Content-Disposition': 'attachment; filename=games.ndjson'
+    }
+    # Streamed chunk by chunk, so only gzip is offered; a q-value of 0 refuses it
+    if parse_accept_header(request.headers.get('Accept-Encoding')).quality('gzip') > 0:
+        body = gzip_chunks(body)
+        headers['Content-Encoding'] = 'gzip'
+    
+    return current_app.response_class(stream_with_context(body), mimetype='application/x-ndjson', headers=headers)
+
+@bp.route('/api/search', methods=['GET'])
+def search():
+    try:
+        limit = min(int(request.args.get('limit', DEFAULT_SEARCH_SIZE)), MAX_SEARCH_SIZE)
+    except ValueError:
+        return jsonify({'error': f"Invalid limit: {request.args.get('limit')} - must be an integer"}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+    
+    try:
+        # Best matches first; ranking and matching happen in the full-text index
+        hits, next_cursor = search_clues(request.args.get('q'), limit, cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except SearchUnavailable as e:
+        return jsonify({'error': str(e)}), 503
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    response = jsonify([{
+        'id': str(hit.clue_id),
+        'value': hit.value,
+        'answer': hit.answer,
+        'question': hit.question,
+        'category': {'id': str(hit.category_id), 'title': hit.category_title},
+        'game': {'id': hit.game_id, 'title': hit.game_title}
+    } for hit in hits])
+    
+    # Same paging headers as the game list
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = '<{}>; rel="next"'.format(
+            url_for('main.search', _external=False, **dict(request.args.items(), cursor=next_cursor)))
+    return response
+
+@bp.route('/api/games/<game_id>/categories', methods=['POST'])
 def add_category(game_id):
     data = request.get_json()
     if not data or 'title' not in data:
@@ -187,7 +514,9 @@ def add_category(game_id):
         )
         
         db.session.add(category)
+        game.updated = datetime.now()
         db.session.commit()
+        board_changed(game.id)
         
         return jsonify({
             'id': str(category.id),
@@ -197,7 +526,7 @@ def add_category(game_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>/categories/<category_id>/clues', methods=['POST'])
+@bp.route('/api/games/<game_id>/categories/<category_id>/clues', methods=['POST'])
 def add_clue(game_id, category_id):
     data = request.get_json()
     if not data or 'value' not in data or 'answer' not in data or 'question' not in data:
@@ -236,7 +565,9 @@ def add_clue(game_id, category_id):
         )
         
         db.session.add(clue)
+        touch_game(game_id_int)
         db.session.commit()
+        board_changed(game_id_int)
         print(f"Clue created successfully: id={clue.id}, category_id={category.id}, game_id={game_id}")
         
         return jsonify({
@@ -250,23 +581,33 @@ def add_clue(game_id, category_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>/categories', methods=['GET'])
+@bp.route('/api/games/<game_id>/categories', methods=['GET'])
 def get_categories(game_id):
     try:
-        game = Game.query.get(game_id)
-        if game is None:
+        game_id_int = parse_id(game_id)
+        if game_id_int is None:
             return jsonify({'error': 'Game not found'}), 404
         
+        found, updated = get_board_version(game_id_int)
+        if not found:
+            return jsonify({'error': 'Game not found'}), 404
+        
+        etag = version_etag('categories', game_id_int, updated)
+        cached = not_modified(etag, updated)
+        if cached is not None:
+            return cached
+        
+        game = Game.query.get(game_id_int)
         categories = [{
             'id': category.id,
             'title': category.title
         } for category in game.categories]
         
-        return jsonify(categories)
+        return with_validators(jsonify(categories), etag, updated)
     except SQLAlchemyError as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>/categories/<category_id>', methods=['DELETE'])
+@bp.route('/api/games/<game_id>/categories/<category_id>', methods=['DELETE'])
 def delete_category(game_id, category_id):
     try:
         # Ensure proper type conversion for IDs
@@ -278,25 +619,21 @@ def delete_category(game_id, category_id):
             print(error_msg)
             return jsonify({'error': error_msg}), 400
             
-        category = Category.query.get(category_id_int)
-        
-        if category is None or category.game_id != game_id_int:
+        # Delete the category and all of its clues without loading them
+        if not delete_category_rows(game_id_int, category_id_int):
+            db.session.rollback()
             return jsonify({'error': f'Category not found with id={category_id_int} for game_id={game_id_int}'}), 404
         
-        # Delete all clues in the category
-        for clue in category.clues:
-            db.session.delete(clue)
-            
-        # Delete the category
-        db.session.delete(category)
+        touch_game(game_id_int)
         db.session.commit()
+        board_changed(game_id_int)
         
         return jsonify({'success': True, 'message': 'Category deleted successfully'})
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/games/<game_id>/categories/<category_id>/clues', methods=['GET'])
+@bp.route('/api/games/<game_id>/categories/<category_id>/clues', methods=['GET'])
 def get_clues(game_id, category_id):
     try:
         # Ensure proper type conversion for IDs
@@ -307,6 +644,14 @@ def get_clues(game_id, category_id):
             error_msg = f'Invalid ID format: category_id={category_id}, game_id={game_id} - must be integers'
             print(error_msg)
             return jsonify({'error': error_msg}), 400
+        
+        # Any clue change bumps Game.updated, so the game version validates this list too
+        found, updated = get_board_version(game_id_int)
+        etag = version_etag(f'clues-{category_id_int}', game_id_int, updated)
+        if found:
+            cached = not_modified(etag, updated)
+            if cached is not None:
+                return cached
             
         category = Category.query.filter_by(id=category_id_int, game_id=game_id_int).first()
         if category is None:
@@ -320,11 +665,271 @@ def get_clues(game_id, category_id):
             'status': clue.status
         } for clue in category.clues]
         
-        return jsonify(clues)
+        return with_validators(jsonify(clues), etag, updated)
     except SQLAlchemyError as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/status', methods=['GET'])
+def find_session(session_id):
+    session_id_int = parse_id(session_id)
+    return session_store.get(session_id_int) if session_id_int is not None else None
+
+@bp.route('/api/games/<game_id>/sessions', methods=['POST'])
+def create_session(game_id):
+    # Start a played session of a board: a GameInstance with its players
+    data = request.get_json(silent=True) or {}
+    names = data.get('players')
+    if not isinstance(names, list) or not names or not all(isinstance(name, str) and name.strip() for name in names):
+        return jsonify({'error': 'A list of player names is required'}), 400
+    
+    try:
+        game_id_int = parse_id(game_id)
+        found, updated = get_board_version(game_id_int) if game_id_int is not None else (False, None)
+        if not found:
+            return jsonify({'error': 'Game not found'}), 404
+        
+        session = session_store.create(game_id_int, [name.strip() for name in names])
+        return jsonify(session.to_dict()), 201
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        with session.lock:
+            return jsonify(session.to_dict())
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/sessions/<session_id>/events', methods=['POST'])
+def post_session_events(session_id):
+    # Apply one event or {"events": [...]} in memory; persistence is write-behind
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and 'events' in data:
+        events = data['events']
+    else:
+        events = [data]
+    if not isinstance(events, list) or not events:
+        return jsonify({'error': 'At least one event is required'}), 400
+    
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        session_store.apply(session, events, publish=broker.publish)
+    except SessionError as e:
+        return jsonify({'error': str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    with session.lock:
+        return jsonify({
+            'id': session.id,
+            'version': session.version,
+            'scores': session.scores,
+            'current_player': session.current_player,
+            'ended': session.ended
+        })
+
+@bp.route('/api/sessions/<session_id>/stream', methods=['GET'])
+def stream_session(session_id):
+    # Server-Sent Events: a snapshot of the session, then small deltas as the game is played
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        # Streams stay open for a long time; don't hold a pooled connection meanwhile
+        db.session.close()
+    
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    if session.ended:
+        with session.lock:
+            snapshot = encode_event('snapshot', session.to_dict())
+        return current_app.response_class(snapshot, mimetype='text/event-stream', headers=headers)
+    
+    def snapshot():
+        with session.lock:
+            return encode_event('snapshot', session.to_dict())
+    
+    return current_app.response_class(broker.stream(session.id, snapshot),
+                                      mimetype='text/event-stream', headers=headers)
+
+@bp.route('/join/<session_id>')
+def join_page(session_id):
+    # Landing page of the join link and QR code; the page posts to join_session and submit_answer
+    try:
+        session = find_session(session_id)
+    except SQLAlchemyError:
+        return render_template('join.html', error='The game could not be loaded. Please try again.'), 500
+    if session is None:
+        return render_template('join.html', error='Game session not found.'), 404
+    if session.ended:
+        return render_template('join.html', error='This game has ended.'), 410
+    return render_template('join.html', session_id=session.id)
+
+@bp.route('/api/sessions/<session_id>/guests', methods=['POST'])
+def join_session(session_id):
+    data = request.get_json(silent=True) or {}
+    name = data.get('name')
+    if not isinstance(name, str) or not name.strip():
+        return jsonify({'error': 'Name is required'}), 400
+    
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        guest_id = answer_store.join(session, name.strip()[:255])
+        return jsonify({'guest_id': guest_id, 'name': name.strip()[:255], 'session_id': session.id}), 201
+    except SessionError as e:
+        return jsonify({'error': str(e)}), 409
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/sessions/<session_id>/answers', methods=['POST'])
+def submit_answer(session_id):
+    # Accepted in memory and persisted in batches; the first answer per guest and clue counts
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data.get('guest_id'), str) or not isinstance(data.get('answer'), str):
+        return jsonify({'error': 'guest_id and answer are required'}), 400
+    clue_id = data.get('clue_id')
+    if clue_id is not None:
+        clue_id = parse_id(clue_id)
+        if clue_id is None:
+            return jsonify({'error': 'Invalid ID format - clue_id must be an integer'}), 400
+    
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        accepted = answer_store.submit(session, data['guest_id'], data['answer'][:1000], clue_id)
+    except SessionError as e:
+        return jsonify({'error': str(e)}), 409
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    if accepted:
+        return jsonify({'accepted': True}), 202
+    return jsonify({'accepted': False, 'duplicate': True})
+
+@bp.route('/api/sessions/<session_id>/responses', methods=['GET'])
+def get_session_responses(session_id):
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        return current_app.response_class(answer_store.responses_body(session), mimetype='application/json')
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/sessions/<session_id>/guest-scores', methods=['GET'])
+def get_guest_scores(session_id):
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        return current_app.response_class(answer_store.scores_body(session), mimetype='application/json')
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/sessions/<session_id>/join-link', methods=['POST'])
+def create_join_link(session_id):
+    # Guests open the join link (join_page, /join/<session_id>) by scanning the QR code
+    try:
+        size = min(max(int(request.args.get('size', DEFAULT_SIZE)), MIN_SIZE), MAX_SIZE)
+    except ValueError:
+        return jsonify({'error': f"Invalid size: {request.args.get('size')} - must be an integer"}), 400
+    
+    try:
+        session = find_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    join_link = url_for('main.join_page', session_id=session.id, _external=True)
+    # Only hashes the link; a cold image is rendered in the background
+    key = qr_cache.prepare(join_link, size) if qr_cache.available else None
+    
+    return jsonify({
+        'session_id': session.id,
+        'join_link': join_link,
+        'qr_code': url_for('main.get_qr_code', key=key) if key else None
+    })
+
+@bp.route('/api/qr/<key>.png', methods=['GET'])
+def get_qr_code(key):
+    # Keys are content hashes, so a given URL always serves the same image
+    cached = not_modified(key)
+    if cached is not None:
+        return immutable(cached)
+    
+    try:
+        png = qr_cache.get(key) if len(key) == 32 else None
+    except FutureTimeoutError:
+        return jsonify({'error': 'QR code is still rendering'}), 503, {'Retry-After': '1'}
+    except Exception as e:
+        return jsonify({'error': f'QR code could not be rendered: {e}'}), 500
+    if png is None:
+        return jsonify({'error': 'QR code not found'}), 404
+    
+    response = current_app.response_class(png, mimetype='image/png')
+    response.set_etag(key)
+    return immutable(response)
+
+@bp.route('/assets/<path:filename>', methods=['GET'])
+def get_asset(filename):
+    # Built by `flask build-assets`; names carry a content hash, so serve them immutable
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    path, encoding = precompressed(filename, request.headers.get('Accept-Encoding'))
+    # download_name keeps the .br/.gz suffix out of Content-Disposition
+    response = send_from_directory(DIST_DIR, path, mimetype=mimetype, download_name=os.path.basename(filename))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return immutable(response)
+
+@bp.route('/api/health', methods=['GET'])
+def api_health():
+    # Liveness probe: one round trip through the pool, no table access
+    try:
+        db.session.execute(text('SELECT 1'))
+        return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()})
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
+
+@bp.route('/api/stats', methods=['GET'])
+def api_stats():
+    try:
+        counts, age = stats_cache.get(count_rows)
+    except SQLAlchemyError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify(dict(counts, cache_age_seconds=round(age, 3)))
+
+@bp.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    metrics = {
+        'pool': pool_metrics.snapshot(db.engine.pool),
+        'timestamp': datetime.now().isoformat()
+    }
+    if current_app.config['REQUEST_METRICS']:
+        metrics['requests'] = request_metrics.snapshot()
+    
+    return jsonify(metrics)
+
+@bp.route('/api/status', methods=['GET'])
 def api_status():
     status = {
         'status': 'ok',
@@ -334,14 +939,20 @@ def api_status():
             'category_count': 0,
             'clue_count': 0,
         },
+        'board_cache': board_cache.stats(),
+        'board_loads': board_flight.stats(),
+        'sessions': session_store.stats(),
+        'push': broker.stats(),
+        'guest_answers': answer_store.stats(),
+        'qr_cache': qr_cache.stats(),
         'timestamp': datetime.now().isoformat()
     }
     
     try:
-        # Try database queries
-        status['database']['game_count'] = Game.query.count()
-        status['database']['category_count'] = Category.query.count()
-        status['database']['clue_count'] = Clue.query.count()
+        # Serve cached counts; they are refreshed after writes or when the TTL expires
+        counts, age = stats_cache.get(count_rows)
+        status['database'].update(counts)
+        status['database']['cache_age_seconds'] = round(age, 3)
     except Exception as e:
         status['status'] = 'error'
         status['database']['connected'] = False
@@ -350,53 +961,7 @@ def api_status():
     return jsonify(status)
 
 # Remote answer routes - disabled for now
-# @app.route('/join/<session_id>')
-# def join_game(session_id):
-#     # Check if name is provided
-#     guest_name = request.args.get('name')
-#     
-#     # If no name provided, show the join form first
-#     if not guest_name:
-#         print(f"No guest name provided, showing join form for session: {session_id}")
-#         return render_template('mobile_join.html', session_id=session_id)
-#     
-#     print(f"Guest name provided: {guest_name}")
-#     
-#     # Special case for test session
-#     if session_id == 'test123':
-#         print(f"Creating test session for guest: {guest_name}")
-#         # Create a temporary test session
-#         session_id = create_game_session('test', 'web')
-#         guest_info = {
-#             'guest_id': f'guest-{int(datetime.now().timestamp())}',
-#             'session_id': session_id,
-#             'name': guest_name
-#         }
-#     else:
-#         # Register the guest with a real session
-#         print(f"Registering guest '{guest_name}' for session: {session_id}")
-#         guest_info = register_guest(session_id, guest_name)
-#     
-#     if not guest_info:
-#         # Provide a more helpful error page with error message
-#         print(f"Failed to register guest - session {session_id} not found")
-#         return render_template('mobile_join.html', 
-#                               session_id=session_id, 
-#                               error="Game session not found or has ended. Please try again.")
-#     
-#     # Get additional parameters
-#     show_clue = request.args.get('showClue', 'false').lower() == 'true'
-#     
-#     print(f"Rendering mobile template with showClue={show_clue}")
-#     
-#     # Render the mobile answer template
-#     return render_template('mobile_answer.html',
-#                           session_id=session_id,
-#                           guest_id=guest_info['guest_id'],
-#                           guest_name=guest_name,
-#                           show_clue=show_clue)
-# 
-# @app.route('/api/remote/<game_id>/create', methods=['POST'])
+# @bp.route('/api/remote/<game_id>/create', methods=['POST'])
 # def create_remote_session(game_id):
 #     # Create a new remote session
 #     host_sid = request.args.get('host_sid', 'web')
@@ -413,19 +978,19 @@ def api_status():
 #         'join_link': join_link
 #     })
 # 
-# @app.route('/api/remote/<session_id>/responses', methods=['GET'])
+# @bp.route('/api/remote/<session_id>/responses', methods=['GET'])
 # def get_responses(session_id):
 #     # Get all guest responses for the current clue
 #     responses = get_guest_responses(session_id)
 #     return jsonify(responses)
 # 
-# @app.route('/api/remote/<session_id>/scores', methods=['GET'])
+# @bp.route('/api/remote/<session_id>/scores', methods=['GET'])
 # def get_scores(session_id):
 #     # Get all guest scores for the session
 #     scores = get_guest_scores(session_id)
 #     return jsonify(scores)
 # 
-# @app.route('/api/remote/<session_id>/broadcast', methods=['POST'])
+# @bp.route('/api/remote/<session_id>/broadcast', methods=['POST'])
 # def broadcast_to_guests(session_id):
 #     data = request.get_json()
 #     
@@ -459,6 +1024,7 @@ def api_status():
 #     return jsonify({'success': result})
 
 if __name__ == '__main__':
+    app = create_app()
     port = int(os.environ.get("PORT", 5000))
     # Using standard Flask run instead of SocketIO
     app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG', 'True') == 'True')
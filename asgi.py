@@ -0,0 +1,352 @@
+"""
+ASGI entry point for GracefulTable Jeopardy.
+
+The read endpoints below are served as async views on SQLAlchemy's asyncio
+engine (psycopg 3 async on PostgreSQL, aiosqlite on SQLite), so a worker
+keeps serving other requests while one waits on the database:
+
+    GET /api/games
+    GET /api/games/<id>
+    GET /api/games/<id>/categories
+    GET /api/games/<id>/categories/<category_id>/clues
+    GET /api/search
+
+They answer exactly like the Flask views, with the same ETags, compression
+and board cache. Every other route (writes, sessions, Server-Sent Events, pages)
+is handed to the Flask app unchanged through asgiref's WsgiToAsgi, which
+runs it on a thread pool. wsgi.py keeps working as before.
+
+    uvicorn asgi:app --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 asgi:app
+"""
+
+import re
+from datetime import timezone
+from urllib.parse import parse_qsl, urlencode
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+
+from app import (create_app, version_etag, game_list_params, game_list_etag, DEFAULT_SEARCH_SIZE,
+                 MAX_SEARCH_SIZE)
+from boards import board_load_options, board_version_query, game_list_version_query, game_page_query, game_page
+from cache import board_cache, board_flight
+from config import async_database_url, async_engine_options_from_env
+from encoding import (accepted_encoding, board_format, board_body, put_board, pack_board, compress,
+                      COMPRESS_MIN_SIZE, COMPRESSIBLE_TYPES, BOARD_TYPES)
+from models import Game, Category, Clue
+from search import search_query, search_page, has_search_index, MISSING_INDEX
+
+
+class Request:
+    __slots__ = ('path', 'args', 'headers')
+
+    def __init__(self, scope):
+        self.path = scope['path']
+        self.args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope['headers']}
+
+
+class Response:
+    __slots__ = ('status', 'body', 'headers')
+
+    def __init__(self, body=b'', status=200, content_type='application/json'):
+        self.status = status
+        self.body = body
+        self.headers = [('content-type', content_type)] if body or status != 304 else []
+
+
+class AsyncReads:
+    """ASGI app serving the hot read endpoints natively and everything else through Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.engine = None
+        self.session_factory = None
+        self.routes = [
+            (re.compile(r'/api/games'), self.list_games),
+            (re.compile(r'/api/games/(\d+)'), self.get_game),
+            (re.compile(r'/api/games/(\d+)/categories'), self.get_categories),
+            (re.compile(r'/api/games/(\d+)/categories/(\d+)/clues'), self.get_clues),
+            (re.compile(r'/api/search'), self.search)
+        ]
+
+    def _start(self):
+        # Async engines are bound to the event loop, so build it inside the server
+        if self.engine is None:
+            database_url = self.flask_app.config['SQLALCHEMY_DATABASE_URI']
+            self.engine = create_async_engine(async_database_url(database_url),
+                                              **async_engine_options_from_env(database_url))
+            self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def _stop(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, view in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    self._start()
+                    request = Request(scope)
+                    response = await view(request, *match.groups())
+                    return await self.send(send, self.compress(request, response))
+
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self._stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def send(self, send, response):
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in response.headers]
+        headers.append((b'content-length', str(len(response.body)).encode('latin-1')))
+        if self.flask_app.config['CORS_ENABLED']:
+            headers.append((b'access-control-allow-origin', b'*'))
+        await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.body})
+
+    def compress(self, request, response):
+        # Same rules as encoding.compress_response() for Flask responses
+        headers = dict(response.headers)
+        if (response.status != 200 or 'content-encoding' in headers or len(response.body) < COMPRESS_MIN_SIZE
+                or headers.get('content-type') not in COMPRESSIBLE_TYPES):
+            return response
+
+        if 'vary' not in headers:
+            response.headers.append(('vary', 'Accept-Encoding'))
+        encoding = accepted_encoding(request.headers.get('accept-encoding'))
+        if encoding is not None:
+            response.body = compress(response.body, encoding)
+            self.with_encoding(response, encoding)
+        return response
+
+    def with_encoding(self, response, encoding):
+        response.headers = [(name, f'W/{value}' if name == 'etag' and not value.startswith('W/') else value)
+                            for name, value in response.headers]
+        response.headers.append(('content-encoding', encoding))
+        return response
+
+    # Responses, shaped like jsonify() and the conditional GET helpers in app.py
+    def json(self, data, status=200):
+        return Response(self.flask_app.json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n', status)
+
+    def error(self, message, status):
+        return self.json({'error': message}, status)
+
+    def not_modified(self, request, etag, last_modified=None):
+        if 'if-none-match' in request.headers:
+            matched = parse_etags(request.headers['if-none-match']).contains_weak(etag)
+        elif 'if-modified-since' in request.headers and last_modified:
+            since = parse_date(request.headers['if-modified-since'])
+            matched = since is not None and last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+        else:
+            matched = False
+        return self.with_validators(Response(status=304), etag, last_modified) if matched else None
+
+    def with_validators(self, response, etag, last_modified=None):
+        response.headers.append(('etag', quote_etag(etag)))
+        if last_modified:
+            response.headers.append(('last-modified', http_date(last_modified)))
+        response.headers.append(('cache-control', 'no-cache'))
+        return response
+
+    def with_next_cursor(self, response, request, next_cursor):
+        if next_cursor:
+            query = urlencode(dict(request.args, cursor=next_cursor))
+            response.headers.append(('x-next-cursor', next_cursor))
+            response.headers.append(('link', f'<{request.path}?{query}>; rel="next"'))
+        return response
+
+    # Views
+    async def list_games(self, request):
+        try:
+            params = game_list_params(request.args)
+        except ValueError as e:
+            return self.error(str(e), 400)
+
+        try:
+            async with self.session_factory() as session:
+                count, max_id, max_updated = (await session.execute(game_list_version_query())).one()
+                etag = game_list_etag(count, max_id, max_updated, params)
+                cached = self.not_modified(request, etag)
+                if cached is not None:
+                    return cached
+
+                query = game_page_query(**params)
+                games, next_cursor = game_page((await session.execute(query)).all(), params['limit'])
+
+            response = self.json([{
+                'id': game.id,
+                'title': game.title,
+                'created': game.created.isoformat()
+            } for game in games])
+            return self.with_validators(self.with_next_cursor(response, request, next_cursor), etag)
+        except SQLAlchemyError as e:
+            return self.error(str(e), 500)
+
+    async def get_game(self, request, game_id):
+        game_id = int(game_id)
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(board_version_query(game_id))).first()
+            if row is None:
+                return self.error('Game not found', 404)
+            updated = row.updated
+
+            fmt = board_format(request.headers.get('accept'))
+            etag = version_etag('board' if fmt == 'json' else f'board-{fmt}', game_id, updated)
+            cached = self.not_modified(request, etag, updated)
+            if cached is not None:
+                return cached
+
+            # Shared with the Flask views, so either path can fill or use it
+            encoding = accepted_encoding(request.headers.get('accept-encoding'))
+            body, applied = board_body(game_id, updated, fmt, encoding)
+            if body is None:
+                # Concurrent misses for this board version await one load instead of each querying
+                built = await board_flight.do_async((game_id, updated, fmt), lambda: self.build_board(game_id, fmt))
+                if built is None:
+                    return self.error('Game not found', 404)
+                plain, built_updated = built
+                body, applied = put_board(game_id, built_updated, fmt, plain, encoding, cached=True)
+
+            response = self.with_validators(Response(body, content_type=BOARD_TYPES[fmt]), etag, updated)
+            response.headers.append(('vary', 'Accept, Accept-Encoding'))
+            return self.with_encoding(response, applied) if applied else response
+        except SQLAlchemyError as e:
+            return self.error(str(e), 500)
+
+    async def build_board(self, game_id, fmt):
+        """Async counterpart of app.build_board; runs on its own session so a cancelled leader can't cut it short."""
+        async with self.session_factory() as session:
+            game = await session.get(Game, game_id, options=board_load_options())
+            if game is None:
+                return None
+            if fmt == 'msgpack':
+                plain = pack_board(game)
+            else:
+                plain = self.flask_app.json.dumps(game.to_dict()).encode('utf-8')
+        board_cache.put(game_id, game.updated, plain, fmt)
+        return plain, game.updated
+
+    async def get_categories(self, request, game_id):
+        game_id = int(game_id)
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(board_version_query(game_id))).first()
+                if row is None:
+                    return self.error('Game not found', 404)
+                updated = row.updated
+
+                etag = version_etag('categories', game_id, updated)
+                cached = self.not_modified(request, etag, updated)
+                if cached is not None:
+                    return cached
+
+                categories = (await session.execute(
+                    select(Category.id, Category.title)
+                    .where(Category.game_id == game_id)
+                    .order_by(Category.position, Category.id)
+                )).all()
+
+            response = self.json([{
+                'id': category.id,
+                'title': category.title
+            } for category in categories])
+            return self.with_validators(response, etag, updated)
+        except SQLAlchemyError as e:
+            return self.error(str(e), 500)
+
+    async def get_clues(self, request, game_id, category_id):
+        game_id, category_id = int(game_id), int(category_id)
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(board_version_query(game_id))).first()
+                updated = row.updated if row is not None else None
+                etag = version_etag(f'clues-{category_id}', game_id, updated)
+                if row is not None:
+                    cached = self.not_modified(request, etag, updated)
+                    if cached is not None:
+                        return cached
+
+                found = (await session.execute(
+                    select(Category.id).where(Category.id == category_id, Category.game_id == game_id)
+                )).first()
+                if found is None:
+                    return self.error(f'Category not found with id={category_id} for game_id={game_id}', 404)
+
+                clues = (await session.execute(
+                    select(Clue.id, Clue.value, Clue.answer, Clue.question, Clue.status)
+                    .where(Clue.category_id == category_id)
+                    .order_by(Clue.value, Clue.id)
+                )).all()
+
+            response = self.json([{
+                'id': clue.id,
+                'value': clue.value,
+                'answer': clue.answer,
+                'question': clue.question,
+                'status': clue.status
+            } for clue in clues])
+            return self.with_validators(response, etag, updated)
+        except SQLAlchemyError as e:
+            return self.error(str(e), 500)
+
+    async def search(self, request):
+        try:
+            limit = min(int(request.args.get('limit', DEFAULT_SEARCH_SIZE)), MAX_SEARCH_SIZE)
+        except ValueError:
+            return self.error(f"Invalid limit: {request.args.get('limit')} - must be an integer", 400)
+        if limit < 1:
+            return self.error('limit must be at least 1', 400)
+
+        try:
+            statement, params = search_query(self.engine.dialect.name, request.args.get('q'), limit,
+                                             cursor=request.args.get('cursor'))
+        except ValueError as e:
+            return self.error(str(e), 400)
+
+        try:
+            async with self.session_factory() as session:
+                try:
+                    rows = (await session.execute(statement, params)).all()
+                except SQLAlchemyError:
+                    await session.rollback()
+                    connection = await session.connection()
+                    if not await connection.run_sync(has_search_index):
+                        return self.error(MISSING_INDEX, 503)
+                    raise
+            hits, next_cursor = search_page(rows, limit)
+        except SQLAlchemyError as e:
+            return self.error(str(e), 500)
+
+        response = self.json([{
+            'id': str(hit.clue_id),
+            'value': hit.value,
+            'answer': hit.answer,
+            'question': hit.question,
+            'category': {'id': str(hit.category_id), 'title': hit.category_title},
+            'game': {'id': hit.game_id, 'title': hit.game_title}
+        } for hit in hits])
+        return self.with_next_cursor(response, request, next_cursor)
+
+
+app = AsyncReads(create_app())
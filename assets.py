@@ -0,0 +1,170 @@
+"""
+Fingerprinted static assets for GracefulTable Jeopardy.
+
+`flask build-assets` copies every file under static/ into static/dist/ under
+a content-hashed name (js/game.js -> js/game.1a2b3c4d5e6f.js), minifying
+JavaScript and CSS when rjsmin/rcssmin are installed, and writes .gz and .br
+(if brotli is installed) siblings next to each text asset. static/dist/
+manifest.json maps source paths to hashed paths. A rebuild adds the new
+hashed files next to the old ones and then swaps the manifest in
+atomically, so pages already rendered from the previous manifest keep
+working; --clean removes files the new manifest no longer references.
+
+Templates link assets with asset_url('js/game.js'). With a manifest the URL
+points at the hashed file under /assets/, which is served precompressed and
+with an immutable, one-year Cache-Control; a repeat visit fetches no static
+bytes at all. Without a manifest (a checkout that was never built) asset_url
+falls back to the plain Flask static URL.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+import click
+from flask import url_for
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # .br siblings are skipped; .gz is always written
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # JavaScript is copied unminified
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # CSS is copied unminified
+    rcssmin = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+HASH_LENGTH = 12
+PRECOMPRESSED_TYPES = ('.js', '.css', '.svg', '.html', '.json', '.txt')
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# Source path -> hashed path and the manifest mtime it was read at; {} when nothing was built
+_manifest = None
+_manifest_mtime = None
+
+
+def minify(filename, data):
+    if filename.endswith('.js') and rjsmin is not None:
+        return rjsmin.jsmin(data.decode('utf-8')).encode('utf-8')
+    if filename.endswith('.css') and rcssmin is not None:
+        return rcssmin.cssmin(data.decode('utf-8')).encode('utf-8')
+    return data
+
+
+def hashed_name(filename, data):
+    root, ext = os.path.splitext(filename)
+    return f'{root}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}'
+
+
+def write_file(path, data):
+    # Write-then-rename, so a live server never serves a partly written file
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def build_assets(source=STATIC_DIR, dest=DIST_DIR, clean=False):
+    """Build hashed copies of source into dest; returns the manifest.
+
+    Files from earlier builds are kept unless clean is set, since pages
+    rendered before the rebuild still reference them.
+    """
+    manifest = {}
+    for directory, subdirs, files in os.walk(source):
+        subdirs[:] = sorted(d for d in subdirs if os.path.join(directory, d) != dest)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            filename = os.path.relpath(path, source).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                data = minify(filename, f.read())
+
+            target = hashed_name(filename, data)
+            manifest[filename] = target
+            output = os.path.join(dest, target)
+            if os.path.isfile(output):
+                # Same content hash as an earlier build; its siblings are already there
+                continue
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+
+            # Siblings first and the asset itself last, so an existing asset implies complete siblings
+            if filename.endswith(PRECOMPRESSED_TYPES):
+                # mtime=0 keeps the .gz bytes reproducible across builds
+                write_file(output + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    write_file(output + '.br', brotli.compress(data, quality=11))
+            write_file(output, data)
+
+    # Swap the manifest in last; workers pick it up on their next page render
+    write_file(os.path.join(dest, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    if clean:
+        keep = set(manifest.values())
+        for directory, _, files in os.walk(dest):
+            for name in files:
+                path = os.path.join(directory, name)
+                filename = os.path.relpath(path, dest).replace(os.sep, '/')
+                for suffix in ('.gz', '.br'):
+                    if filename.endswith(suffix):
+                        filename = filename[:-len(suffix)]
+                if filename != 'manifest.json' and filename not in keep:
+                    os.remove(path)
+    return manifest
+
+
+def load_manifest():
+    """The current manifest, re-read whenever a rebuild has replaced it."""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = os.stat(MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if _manifest is None or mtime != _manifest_mtime:
+        try:
+            with open(MANIFEST_PATH) as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {}
+        _manifest_mtime = mtime
+    return _manifest
+
+
+def asset_url(filename):
+    """Template helper: the fingerprinted URL for a static file, or its plain static URL."""
+    hashed = load_manifest().get(filename)
+    if hashed is None:
+        return url_for('static', filename=filename)
+    return url_for('main.get_asset', filename=hashed)
+
+
+def precompressed(filename, header):
+    """Pick the best precompressed sibling of a built asset: (filename, encoding) or (filename, None)."""
+    accept = parse_accept_header(header)
+    choices = sorted(PRECOMPRESSED, key=lambda choice: -accept.quality(choice[0]))
+    for encoding, suffix in choices:
+        if accept.quality(encoding) > 0 and os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+            return filename + suffix, encoding
+    return filename, None
+
+
+def init_assets(app):
+    app.add_template_global(asset_url)
+
+
+@click.command('build-assets')
+@click.option('--clean', is_flag=True, help='Remove files that the new manifest no longer references.')
+def build_assets_command(clean):
+    """Write fingerprinted, precompressed copies of static/ to static/dist/."""
+    manifest = build_assets(clean=clean)
+    click.echo(f'Built {len(manifest)} assets into {os.path.relpath(DIST_DIR)}')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Guest answer ingestion benchmark for GracefulTable Jeopardy.
+
+Joins G guests to one session, then for each of K clues opens the clue
+and has every guest submit an answer at once from a pool of threads, the
+burst that happens when a clue closes. Reports sustained submissions per
+second with latency percentiles, the cost of the host's responses and
+scores reads, and checks that every answer was persisted by the batched
+write-behind.
+
+    python benchmarks/answers_bench.py --guests 500 --clues 30 --concurrency 16
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import print_scenarios, summarize, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='database to use (default: temporary SQLite file)')
+    parser.add_argument('--guests', type=int, default=300, help='guests per session (G)')
+    parser.add_argument('--clues', type=int, default=30, help='clues played (K)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--output', help='results file (default: bench_results/answers-<timestamp>.json)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-answers-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from app import create_app
+    from game_sessions import session_store
+    from models import db, GuestAnswer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    values = [200, 400, 600, 800, 1000]
+    categories = -(-args.clues // len(values))
+    game = client.post('/api/games/bulk', json={'title': 'Answers benchmark', 'categories': [{
+        'title': f'Category {c}',
+        'clues': [{'value': value, 'answer': f'Clue {c}-{value}', 'question': f'Response {c} {value}'}
+                  for value in values]
+    } for c in range(categories)]}).get_json()
+    clue_ids = [clue_id for category in game['categories'] for clue_id in category['clues']][:args.clues]
+    session_id = client.post(f"/api/games/{game['id']}/sessions", json={'players': ['Host']}).get_json()['id']
+
+    print(f"Joining {args.guests} guests to session {session_id}...")
+    guest_ids = [client.post(f'/api/sessions/{session_id}/guests', json={'name': f'Guest {i}'}).get_json()['guest_id']
+                 for i in range(args.guests)]
+
+    local = threading.local()
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def submit(job):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        guest_id, answer = job
+        start = time.perf_counter()
+        response = local.client.post(f'/api/sessions/{session_id}/answers',
+                                     json={'guest_id': guest_id, 'answer': answer})
+        elapsed = time.perf_counter() - start
+        with lock:
+            if response.status_code == 202:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+
+    read_latencies = {'responses': [], 'guest_scores': []}
+    print(f"Playing {len(clue_ids)} clues with {args.concurrency} submitting threads...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for index, clue_id in enumerate(clue_ids):
+            client.post(f'/api/sessions/{session_id}/events', json={'type': 'select_clue', 'clue_id': clue_id})
+            # Every third guest knows the response
+            jobs = [(guest_id, f'What is response {index}?' if g % 3 == 0 else f'guess {g % 7}')
+                    for g, guest_id in enumerate(guest_ids)]
+            list(pool.map(submit, jobs))
+
+            for name, path in (('responses', 'responses'), ('guest_scores', 'guest-scores')):
+                for _ in range(5):
+                    start = time.perf_counter()
+                    client.get(f'/api/sessions/{session_id}/{path}')
+                    read_latencies[name].append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    scenarios = {'submit_answer': summarize(latencies, errors[0], elapsed)}
+    for name, samples in read_latencies.items():
+        scenarios[name] = summarize(samples, 0, sum(samples))
+    print_scenarios(scenarios)
+
+    # Let the write-behind catch up, then check nothing was lost
+    session_store.request_flush()
+    deadline = time.monotonic() + 30
+    expected = len(latencies)
+    persisted = 0
+    while time.monotonic() < deadline:
+        with app.app_context():
+            persisted = db.session.execute(
+                db.select(db.func.count(GuestAnswer.id)).where(GuestAnswer.game_instance_id == session_id)
+            ).scalar()
+        if persisted >= expected:
+            break
+        time.sleep(0.2)
+
+    stats = session_store.stats()
+    print(f"\nAccepted {expected} answers, persisted {persisted}, write-behind flushes {stats['flushes']}")
+
+    output = write_results('answers', {
+        'parameters': {
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'guests': args.guests,
+            'clues': len(clue_ids),
+            'concurrency': args.concurrency
+        },
+        'scenarios': scenarios,
+        'persisted': persisted,
+        'flushes': stats['flushes']
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+REST API benchmark for GracefulTable Jeopardy.
+
+Seeds N games of M categories x K clues through the models, then drives
+list_games, get_game, add_clue, the board save flow and delete_game
+concurrently and reports throughput and latency percentiles per scenario.
+
+Requests go through the Flask test client by default, or to a running
+server (for example a local gunicorn) with --base-url; in that case point
+--database-url at the same database the server uses.
+
+    python benchmarks/api_bench.py --games 200 --concurrency 8
+    python benchmarks/api_bench.py --database-url postgresql://localhost/jeopardy_bench
+    python benchmarks/api_bench.py --compare bench_results/api-20261017-120000.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from common import compare_scenarios, print_scenarios, summarize, write_results
+
+SCENARIOS = ['list_games', 'get_game', 'add_clue', 'save_board', 'delete_game']
+CLUE_VALUES = [200, 400, 600, 800, 1000]
+
+
+class TestClientDriver:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, payload=None):
+        response = self.client.open(path, method=method, json=payload)
+        return response.status_code, response.get_data()
+
+
+class HttpDriver:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+def make_board(title, categories, clues):
+    return {
+        'title': title,
+        'categories': [{
+            'title': f'Category {c}',
+            'clues': [{
+                'value': CLUE_VALUES[k % len(CLUE_VALUES)],
+                'answer': f'Benchmark answer {c}-{k} ' + 'x' * 40,
+                'question': f'What is benchmark question {c}-{k}?'
+            } for k in range(clues)]
+        } for c in range(categories)]
+    }
+
+
+def seed(app, games, categories, clues):
+    from boards import insert_board, validate_board
+    from models import db, Category
+
+    with app.app_context():
+        game_ids = []
+        for i in range(games):
+            game, created = insert_board(validate_board(make_board(f'Benchmark game {i}', categories, clues)))
+            game_ids.append(game.id)
+            if i % 100 == 99:
+                db.session.commit()
+        db.session.commit()
+
+        category_ids = db.session.execute(
+            db.select(Category.game_id, Category.id).where(Category.game_id.in_(game_ids[:500]))
+        ).all()
+        return game_ids, [tuple(row) for row in category_ids]
+
+
+def run_scenario(make_driver, concurrency, jobs):
+    """Run (method, path, payload) jobs across threads; returns (summary, responses)."""
+    local = threading.local()
+    latencies = []
+    responses = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def run(job):
+        if not hasattr(local, 'driver'):
+            local.driver = make_driver()
+        method, path, payload = job
+        start = time.perf_counter()
+        try:
+            status, body = local.driver.request(method, path, payload)
+        except Exception:
+            status, body = None, b''
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            if status is not None and 200 <= status < 300:
+                latencies.append(elapsed)
+                responses.append(body)
+            else:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, jobs))
+    return summarize(latencies, errors[0], time.perf_counter() - start), responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='database to seed and use (default: temporary SQLite file)')
+    parser.add_argument('--base-url', help='drive a running server instead of the Flask test client')
+    parser.add_argument('--games', type=int, default=100, help='games to seed (N)')
+    parser.add_argument('--categories', type=int, default=6, help='categories per game (M)')
+    parser.add_argument('--clues', type=int, default=5, help='clues per category (K)')
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated subset to run')
+    parser.add_argument('--no-board-cache', action='store_true', help='disable the in-process board cache')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for request selection')
+    parser.add_argument('--output', help='results file (default: bench_results/api-<timestamp>.json)')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='regression threshold for --compare')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-bench-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    if args.no_board_cache:
+        os.environ['BOARD_CACHE_SIZE'] = '0'
+
+    from app import create_app
+    from models import db
+    app = create_app()
+    # create_app() leaves the schema to migrations; an empty benchmark database needs the tables
+    with app.app_context():
+        db.create_all()
+
+    random.seed(args.seed)
+    print(f"Seeding {args.games} games ({args.categories}x{args.clues}) into {os.environ['DATABASE_URL']}")
+    game_ids, category_ids = seed(app, args.games, args.categories, args.clues)
+
+    if args.base_url:
+        make_driver = lambda: HttpDriver(args.base_url)  # noqa: E731
+    else:
+        make_driver = lambda: TestClientDriver(app)  # noqa: E731
+
+    board = make_board('Benchmark save', args.categories, args.clues)
+    saved_ids = []
+    scenarios = {}
+
+    for name in [s for s in args.scenarios.split(',') if s]:
+        if name == 'list_games':
+            jobs = [('GET', '/api/games', None)] * args.requests
+        elif name == 'get_game':
+            jobs = [('GET', f'/api/games/{random.choice(game_ids)}', None) for _ in range(args.requests)]
+        elif name == 'add_clue':
+            jobs = []
+            for _ in range(args.requests):
+                game_id, category_id = random.choice(category_ids)
+                jobs.append(('POST', f'/api/games/{game_id}/categories/{category_id}/clues',
+                             {'value': '200', 'answer': 'Added by benchmark', 'question': 'What is a benchmark?'}))
+        elif name == 'save_board':
+            jobs = [('POST', '/api/games/bulk', board)] * args.requests
+        elif name == 'delete_game':
+            # Delete the boards saved above, or seeded games if save_board was skipped
+            targets = saved_ids or game_ids
+            jobs = [('DELETE', f'/api/games/{game_id}', None) for game_id in targets[:args.requests]]
+        else:
+            parser.error(f'Unknown scenario: {name}')
+
+        print(f"Running {name} ({len(jobs)} requests, concurrency {args.concurrency})...")
+        scenarios[name], responses = run_scenario(make_driver, args.concurrency, jobs)
+
+        if name == 'save_board':
+            saved_ids = [json.loads(body)['id'] for body in responses]
+
+    print_scenarios(scenarios)
+
+    database = os.environ['DATABASE_URL'].split(':', 1)[0]
+    output = write_results('api', {
+        'parameters': {
+            'database': database,
+            'mode': 'http' if args.base_url else 'test_client',
+            'games': args.games,
+            'categories': args.categories,
+            'clues': args.clues,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'board_cache': not args.no_board_cache
+        },
+        'scenarios': scenarios
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare_scenarios(scenarios, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+WSGI vs ASGI serving benchmark for GracefulTable Jeopardy.
+
+Seeds a database, then for each mode starts a real server in a subprocess
+and holds C concurrent keep-alive clients against the read endpoints for D
+seconds, reporting requests/second and latency percentiles per mode:
+
+    wsgi   gunicorn -w W wsgi:app            (sync workers, as in the Procfile)
+    asgi   uvicorn asgi:app --workers W      (async read views)
+
+    python benchmarks/asgi_bench.py --concurrency 200 --duration 15 --workers 2
+    python benchmarks/asgi_bench.py --database-url postgresql://localhost/jeopardy_bench
+
+Needs gunicorn, uvicorn, asgiref and the async driver (aiosqlite for SQLite,
+psycopg 3 for PostgreSQL). The async views pay off when requests wait on a
+networked database; against a local SQLite file there is little I/O to
+overlap, so run it against PostgreSQL for representative numbers.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from common import ROOT, print_scenarios, summarize, write_results
+
+COMMANDS = {
+    'wsgi': ['-m', 'gunicorn', '-w', '{workers}', '-b', '127.0.0.1:{port}', '--log-level', 'warning', 'wsgi:app'],
+    'asgi': ['-m', 'uvicorn', 'asgi:app', '--workers', '{workers}', '--host', '127.0.0.1', '--port', '{port}',
+             '--log-level', 'warning', '--no-access-log']
+}
+
+
+def seed(games):
+    """Create boards through the API and build the search index; returns (game_id, category_id) pairs."""
+    from app import create_app
+    from models import db
+    from search import rebuild_search_index
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            rebuild_search_index(connection)
+
+    client = app.test_client()
+    boards = []
+    for g in range(games):
+        game = client.post('/api/games/bulk', json={'title': f'ASGI benchmark {g}', 'categories': [{
+            'title': f'Category {c}',
+            'clues': [{'value': value, 'answer': f'Clue {g} {c} {value}', 'question': f'What is answer {value}?'}
+                      for value in (200, 400, 600, 800, 1000)]
+        } for c in range(6)]}).get_json()
+        boards.append((game['id'], game['categories'][0]['id']))
+    return boards
+
+
+def request_paths(boards, count=1000):
+    rng = random.Random(7)
+    paths = []
+    for _ in range(count):
+        game_id, category_id = rng.choice(boards)
+        paths.append(rng.choice([
+            f'/api/games/{game_id}',
+            f'/api/games/{game_id}',
+            f'/api/games/{game_id}/categories',
+            f'/api/games/{game_id}/categories/{category_id}/clues',
+            '/api/games?limit=20',
+            f'/api/search?q=answer+{rng.choice([200, 400, 600])}'
+        ]))
+    return paths
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, workers):
+    port = free_port()
+    args = [part.format(workers=workers, port=port) for part in COMMANDS[mode]]
+    process = subprocess.Popen([sys.executable] + args, cwd=ROOT, env=os.environ.copy())
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode} server exited with {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1):
+                return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+async def client(port, paths, offset, deadline, latencies, failures):
+    """One keep-alive HTTP/1.1 client; reconnects when the server closes the connection."""
+    reader = writer = None
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode('latin-1'))
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                writer = None
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures[0] += 1
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            failures[0] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, paths, concurrency, duration):
+    latencies = []
+    failures = [0]
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, paths, i * 7, deadline, latencies, failures) for i in range(concurrency)))
+    return summarize(latencies, failures[0], time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='empty database to seed (default: temporary SQLite file)')
+    parser.add_argument('--modes', default='wsgi,asgi', help='comma-separated modes to run')
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes (W)')
+    parser.add_argument('--concurrency', type=int, default=200, help='concurrent clients (C)')
+    parser.add_argument('--duration', type=float, default=15, help='seconds per mode (D)')
+    parser.add_argument('--warmup', type=float, default=2, help='seconds of warmup per mode')
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--output', help='results file (default: bench_results/asgi-<timestamp>.json)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-asgi-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('CORS_ENABLED', 'False')
+
+    print(f"Seeding {args.games} games...")
+    paths = request_paths(seed(args.games))
+
+    scenarios = {}
+    for mode in args.modes.split(','):
+        process, port = start_server(mode, args.workers)
+        try:
+            print(f"{mode}: {args.concurrency} clients for {args.duration}s against port {port}...")
+            asyncio.run(drive(port, paths, min(args.concurrency, 20), args.warmup))
+            scenarios[mode] = asyncio.run(drive(port, paths, args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print_scenarios(scenarios)
+
+    output = write_results('asgi', {
+        'parameters': {
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'workers': args.workers,
+            'concurrency': args.concurrency,
+            'duration': args.duration
+        },
+        'scenarios': scenarios
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Shared helpers for the GracefulTable Jeopardy benchmark scripts.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+# Benchmarks are run as scripts from the repository root or this directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from metrics import percentile  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'bench_results')
+
+
+def summarize(latencies, errors, elapsed):
+    """Throughput and latency percentiles (ms) for one scenario."""
+    latencies = sorted(latencies)
+    completed = len(latencies)
+    return {
+        'requests': completed + errors,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p95': round(percentile(latencies, 95) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if latencies else 0.0
+        }
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(name, results, output=None):
+    """Save results as JSON with run metadata and return the file path."""
+    document = {
+        'benchmark': name,
+        'timestamp': datetime.now().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        **results
+    }
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    return output
+
+
+def compare_scenarios(current, baseline_path, threshold=0.10):
+    """Print per-scenario changes against a saved run; returns True on regression.
+
+    A scenario regresses when its p95 latency grows or its throughput drops
+    by more than threshold (a fraction).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f).get('scenarios', {})
+
+    regressed = False
+    print(f"\nComparison with {baseline_path}:")
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            print(f"  {name:<14} (not in baseline)")
+            continue
+
+        p95_change = _change(before['latency_ms']['p95'], result['latency_ms']['p95'])
+        rps_change = _change(before['throughput_rps'], result['throughput_rps'])
+        flag = ''
+        if p95_change > threshold or rps_change < -threshold:
+            flag = '  <-- regression'
+            regressed = True
+        print(f"  {name:<14} p95 {p95_change:+.1%}  throughput {rps_change:+.1%}{flag}")
+
+    return regressed
+
+
+def _change(before, after):
+    return (after - before) / before if before else 0.0
+
+
+def print_scenarios(scenarios):
+    print(f"\n{'scenario':<14} {'reqs':>6} {'err':>4} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, result in scenarios.items():
+        latency = result['latency_ms']
+        print(f"{name:<14} {result['requests']:>6} {result['errors']:>4} {result['throughput_rps']:>9} "
+              f"{latency['p50']:>9} {latency['p95']:>9} {latency['p99']:>9}")
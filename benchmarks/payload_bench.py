@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Board payload benchmark for GracefulTable Jeopardy.
+
+Seeds boards of realistic size (C categories of 5 clues with clue-length
+text), then requests GET /api/games/<id> in every negotiated variant (JSON
+or MessagePack, identity, gzip or brotli) and reports bytes on the wire and
+latency with a cold and a warm board cache.
+
+    python benchmarks/payload_bench.py --categories 6 --requests 200
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import print_scenarios, summarize, write_results
+
+VARIANTS = {
+    'json': {},
+    'json_gzip': {'Accept-Encoding': 'gzip'},
+    'json_br': {'Accept-Encoding': 'br, gzip'},
+    'msgpack': {'Accept': 'application/msgpack'},
+    'msgpack_br': {'Accept': 'application/msgpack', 'Accept-Encoding': 'br, gzip'}
+}
+
+WORDS = ('this famous author wrote a novel about the sea whose captain hunts a white whale across '
+         'oceans in the nineteenth century while the crew of his ship fears for their lives').split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--categories', type=int, default=6, help='categories per board (C)')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200, help='requests per variant')
+    parser.add_argument('--output', help='results file (default: bench_results/payload-<timestamp>.json)')
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix='jeopardy-payload-', suffix='.db')
+    os.close(fd)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from app import create_app
+    from cache import board_cache
+    from encoding import brotli, msgpack
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    rng = random.Random(3)
+    game_ids = [client.post('/api/games/bulk', json={'title': f'Payload benchmark {g}', 'categories': [{
+        'title': f'Category {c}',
+        'clues': [{'value': value,
+                   'answer': ' '.join(rng.choices(WORDS, k=18)).capitalize() + '.',
+                   'question': f'Who is {rng.choice(WORDS)} {rng.choice(WORDS)}?'}
+                  for value in (200, 400, 600, 800, 1000)]
+    } for c in range(args.categories)]}).get_json()['id'] for g in range(args.games)]
+
+    sizes = {}
+    scenarios = {}
+    for name, headers in VARIANTS.items():
+        if (name.startswith('msgpack') and msgpack is None) or (name.endswith('_br') and brotli is None):
+            print(f"skipping {name}: optional package not installed")
+            continue
+        response = client.get(f'/api/games/{game_ids[0]}', headers=headers)
+        sizes[name] = {'bytes': len(response.get_data()),
+                       'content_type': response.mimetype,
+                       'content_encoding': response.headers.get('Content-Encoding')}
+
+        for cache_state in ('cold', 'warm'):
+            latencies = []
+            for i in range(args.requests):
+                if cache_state == 'cold':
+                    board_cache.clear()
+                start = time.perf_counter()
+                client.get(f'/api/games/{game_ids[i % len(game_ids)]}', headers=headers)
+                latencies.append(time.perf_counter() - start)
+            scenarios[f'{name}_{cache_state}'] = summarize(latencies, 0, sum(latencies))
+
+    print(f"\nBoard of {args.categories} categories x 5 clues:")
+    for name, size in sizes.items():
+        ratio = size['bytes'] / sizes['json']['bytes']
+        print(f"  {name:<12} {size['bytes']:>7} bytes  {ratio:6.1%} of plain JSON")
+    print_scenarios(scenarios)
+
+    output = write_results('payload', {
+        'parameters': {'categories': args.categories, 'games': args.games, 'requests': args.requests},
+        'sizes': sizes,
+        'scenarios': scenarios
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Push fan-out load test for GracefulTable Jeopardy.
+
+Opens V simulated viewers on one session's Server-Sent Events stream, then
+posts score events at a fixed rate and measures how long each delta takes
+to reach every viewer (publish-to-receive latency) and how many arrive.
+
+By default the app is served in-process by a threaded Werkzeug server;
+pass --base-url to load a running server instead, for example
+
+    gunicorn -k gthread --threads 400 -w 1 wsgi:app
+    python benchmarks/push_bench.py --viewers 300 --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from common import summarize, write_results
+
+
+def post_json(base_url, path, payload):
+    req = urllib.request.Request(base_url + path, data=json.dumps(payload).encode('utf-8'), method='POST',
+                                 headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return json.loads(response.read())
+
+
+class Viewer(threading.Thread):
+    """Reads one SSE stream and records when each versioned delta arrived."""
+
+    def __init__(self, base_url, session_id, ready):
+        super().__init__(daemon=True)
+        self.url = urllib.parse.urlsplit(base_url)
+        self.session_id = session_id
+        self.ready = ready
+        self.received = {}
+        self.error = None
+        self.connect_seconds = None
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            conn = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=60)
+            conn.request('GET', f'/api/sessions/{self.session_id}/stream')
+            response = conn.getresponse()
+            event = None
+            for raw in response.fp:
+                line = raw.rstrip(b'\n')
+                if line.startswith(b'event: '):
+                    event = line[7:].decode()
+                elif line.startswith(b'data: '):
+                    if event == 'snapshot':
+                        self.connect_seconds = time.perf_counter() - start
+                        self.ready.release()
+                    elif event in ('score', 'game_over'):
+                        data = json.loads(line[6:])
+                        self.received.setdefault(data['version'], time.perf_counter())
+                    if event == 'game_over':
+                        break
+        except Exception as e:
+            self.error = str(e)
+            self.ready.release()
+
+
+def start_local_server():
+    from werkzeug.serving import make_server
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='load a running server instead of an in-process one')
+    parser.add_argument('--viewers', type=int, default=100, help='simulated SSE clients (V)')
+    parser.add_argument('--events', type=int, default=200, help='score events to publish')
+    parser.add_argument('--rate', type=float, default=50, help='events per second')
+    parser.add_argument('--output', help='results file (default: bench_results/push-<timestamp>.json)')
+    args = parser.parse_args()
+
+    if args.base_url:
+        base_url = args.base_url.rstrip('/')
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-push-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+        base_url = start_local_server()
+
+    game = post_json(base_url, '/api/games/bulk', {'title': 'Push benchmark', 'categories': [{
+        'title': 'Category', 'clues': [{'value': 200, 'answer': 'A', 'question': 'Q'}]
+    }]})
+    session_id = post_json(base_url, f"/api/games/{game['id']}/sessions", {'players': ['Host']})['id']
+
+    print(f"Connecting {args.viewers} viewers to session {session_id} at {base_url}...")
+    ready = threading.Semaphore(0)
+    viewers = [Viewer(base_url, session_id, ready) for _ in range(args.viewers)]
+    for viewer in viewers:
+        viewer.start()
+    for _ in viewers:
+        ready.acquire()
+
+    print(f"Publishing {args.events} events at {args.rate}/s...")
+    sent = {}
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    for i in range(args.events):
+        target = start + i * interval
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sent_at = time.perf_counter()
+        result = post_json(base_url, f'/api/sessions/{session_id}/events',
+                           {'type': 'score', 'player_index': 0, 'delta': 1})
+        sent[result['version']] = sent_at
+    final = post_json(base_url, f'/api/sessions/{session_id}/events', {'type': 'end'})
+    sent[final['version']] = time.perf_counter()
+    publish_seconds = time.perf_counter() - start
+
+    for viewer in viewers:
+        viewer.join(timeout=30)
+
+    latencies = []
+    missing = 0
+    for viewer in viewers:
+        for version, sent_at in sent.items():
+            received_at = viewer.received.get(version)
+            if received_at is None:
+                missing += 1
+            else:
+                latencies.append(received_at - sent_at)
+
+    delivery = summarize(latencies, missing, publish_seconds)
+    connect = summarize([v.connect_seconds for v in viewers if v.connect_seconds is not None], 0, 1)
+    errors = [viewer.error for viewer in viewers if viewer.error]
+
+    print(f"\nviewers {args.viewers}, events {len(sent)}, deliveries {len(latencies)}, missing {missing}, "
+          f"viewer errors {len(errors)}")
+    print(f"delivery latency ms: p50 {delivery['latency_ms']['p50']}  p95 {delivery['latency_ms']['p95']}  "
+          f"p99 {delivery['latency_ms']['p99']}  max {delivery['latency_ms']['max']}")
+    print(f"deliveries/s: {delivery['throughput_rps']}")
+    print(f"connect-to-snapshot ms: p50 {connect['latency_ms']['p50']}  p95 {connect['latency_ms']['p95']}")
+
+    output = write_results('push', {
+        'parameters': {
+            'mode': 'http' if args.base_url else 'werkzeug_threaded',
+            'viewers': args.viewers,
+            'events': args.events,
+            'rate': args.rate
+        },
+        'delivery': delivery,
+        'connect_latency_ms': connect['latency_ms'],
+        'viewer_errors': errors[:10]
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Clue search benchmark for GracefulTable Jeopardy.
+
+Seeds N clues of synthetic text, builds the full-text index and times
+GET /api/search for common, rare, multi-word and prefix queries, including
+a deep page reached through the cursor. The same terms are also run as the
+naive LIKE '%term%' scan over clues for comparison.
+
+    python benchmarks/search_bench.py --clues 1000000
+    python benchmarks/search_bench.py --database-url postgresql://localhost/jeopardy_bench
+"""
+
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from common import print_scenarios, summarize, write_results
+
+TOPICS = ('planet river empire novel composer element treaty island painter battle mountain opera '
+          'dynasty comet glacier sonnet volcano senate galaxy desert').split()
+SYLLABLES = 'ka lo mi ren tu sa vel dor an is pe qua rol ti ne bo'.split()
+
+QUERIES = {
+    'common_term': 'planet',
+    'two_terms': 'river empire',
+    'prefix': 'compo',
+    'rare_term': 'zanzibar',
+    'category_title': 'geography'
+}
+
+
+def seed(db, clues, batch=5000):
+    from sqlalchemy import insert
+    from models import Game, Category, Clue
+
+    rng = random.Random(42)
+    # Word frequencies roughly follow Zipf's law, as in real clue text; the
+    # topic words sit just below the stop-word-like head of the distribution
+    filler = [''.join(rng.choices(SYLLABLES, k=3)) for _ in range(20000)]
+    vocabulary = filler[:50] + TOPICS + filler[50:]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    per_category = 5
+    categories_per_game = 6
+    game_id = category_id = clue_id = 0
+    clue_rows = []
+
+    def flush():
+        db.session.execute(insert(Clue), clue_rows)
+        clue_rows.clear()
+
+    while clue_id < clues:
+        game_id += 1
+        db.session.execute(insert(Game), [{'id': game_id, 'title': f'Game {game_id}'}])
+        category_rows = []
+        for c in range(categories_per_game):
+            category_id += 1
+            title = 'Geography' if category_id % 97 == 0 else f'{rng.choice(TOPICS).title()} {category_id}'
+            category_rows.append({'id': category_id, 'game_id': game_id, 'title': title, 'position': c})
+            for value in range(per_category):
+                clue_id += 1
+                words = rng.choices(vocabulary, cum_weights=cum_weights, k=12)
+                if clue_id % 50000 == 0:
+                    words.append('Zanzibar')
+                clue_rows.append({'id': clue_id, 'category_id': category_id, 'value': (value + 1) * 200,
+                                  'answer': ' '.join(words), 'question': f'What is {rng.choice(vocabulary)}?'})
+        db.session.execute(insert(Category), category_rows)
+        if len(clue_rows) >= batch:
+            flush()
+    if clue_rows:
+        flush()
+    db.session.commit()
+    return clue_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='database to use (default: temporary SQLite file)')
+    parser.add_argument('--clues', type=int, default=200000, help='clues to seed (N)')
+    parser.add_argument('--requests', type=int, default=50, help='requests per query')
+    parser.add_argument('--pages', type=int, default=5, help='pages to follow for the deep page scenario')
+    parser.add_argument('--skip-like', action='store_true', help='skip the LIKE scan comparison')
+    parser.add_argument('--output', help='results file (default: bench_results/search-<timestamp>.json)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-search-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from sqlalchemy import text
+    from app import create_app
+    from models import db
+    from search import rebuild_search_index
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        print(f"Seeding {args.clues} clues...")
+        started = time.perf_counter()
+        seeded = seed(db, args.clues)
+        print(f"Seeded {seeded} clues in {time.perf_counter() - started:.1f}s, building index...")
+        started = time.perf_counter()
+        with db.engine.begin() as connection:
+            rebuild_search_index(connection)
+        index_seconds = time.perf_counter() - started
+        print(f"Indexed in {index_seconds:.1f}s")
+
+    client = app.test_client()
+    scenarios = {}
+    for name, q in QUERIES.items():
+        latencies = []
+        errors = 0
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.get('/api/search', query_string={'q': q})
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+        scenarios[name] = summarize(latencies, errors, sum(latencies))
+
+    # Follow the cursor a few pages deep
+    latencies = []
+    errors = 0
+    for _ in range(max(1, args.requests // args.pages)):
+        cursor = None
+        for _ in range(args.pages):
+            start = time.perf_counter()
+            params = {'q': QUERIES['common_term'], 'cursor': cursor} if cursor else {'q': QUERIES['common_term']}
+            response = client.get('/api/search', query_string=params)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+    scenarios['deep_page'] = summarize(latencies, errors, sum(latencies))
+
+    if not args.skip_like:
+        with app.app_context():
+            for name in ('common_term', 'rare_term'):
+                pattern = f"%{QUERIES[name]}%"
+                latencies = []
+                for _ in range(max(1, args.requests // 10)):
+                    start = time.perf_counter()
+                    db.session.execute(text(
+                        'SELECT id FROM clues WHERE answer LIKE :p OR question LIKE :p LIMIT 20'
+                    ), {'p': pattern}).all()
+                    latencies.append(time.perf_counter() - start)
+                scenarios[f'like_scan_{name}'] = summarize(latencies, 0, sum(latencies))
+
+    print_scenarios(scenarios)
+
+    output = write_results('search', {
+        'parameters': {
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'clues': seeded,
+            'requests': args.requests
+        },
+        'index_seconds': round(index_seconds, 3),
+        'scenarios': scenarios
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
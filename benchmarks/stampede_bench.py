@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Board stampede benchmark for GracefulTable Jeopardy.
+
+Simulates a game link going out to a room: for each of R rounds the board
+cache is emptied (as after an edit) and C threads request the same
+GET /api/games/<id> at once. Reports latency percentiles and how many times
+the board was actually loaded from the database, with single-flight
+coalescing on and with it bypassed.
+
+    python benchmarks/stampede_bench.py --clients 50 --rounds 20
+    python benchmarks/stampede_bench.py --database-url postgresql://localhost/jeopardy_bench
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from common import print_scenarios, summarize, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='empty database to seed (default: temporary SQLite file)')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent requests per round (C)')
+    parser.add_argument('--rounds', type=int, default=20, help='cache-cold rounds per scenario (R)')
+    parser.add_argument('--categories', type=int, default=6)
+    parser.add_argument('--clues', type=int, default=5, help='clues per category')
+    parser.add_argument('--output', help='results file (default: bench_results/stampede-<timestamp>.json)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-stampede-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('CORS_ENABLED', 'False')
+
+    import app as app_module
+    from cache import board_cache, board_flight
+    from models import db
+
+    app = app_module.create_app()
+    with app.app_context():
+        db.create_all()
+    game_id = app.test_client().post('/api/games/bulk', json={'title': 'Stampede benchmark', 'categories': [{
+        'title': f'Category {c}',
+        'clues': [{'value': (v + 1) * 200, 'answer': f'Clue {c} {v} ' * 8, 'question': f'What is {c} {v}?'}
+                  for v in range(args.clues)]
+    } for c in range(args.categories)]}).get_json()['id']
+
+    # Count the loads that actually reach the database
+    loads = [0]
+    load_board = app_module.load_board
+
+    def counted_load_board(game_id):
+        loads[0] += 1
+        return load_board(game_id)
+
+    app_module.load_board = counted_load_board
+
+    def run_round(latencies, errors):
+        board_cache.invalidate(game_id)
+        barrier = threading.Barrier(args.clients)
+
+        def client():
+            c = app.test_client()
+            barrier.wait()
+            start = time.perf_counter()
+            status = c.get(f'/api/games/{game_id}').status_code
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[0] += 1
+
+        threads = [threading.Thread(target=client) for _ in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    scenarios = {}
+    board_loads = {}
+    for name in ('uncoalesced', 'single_flight'):
+        if name == 'uncoalesced':
+            board_flight.do = lambda key, fn: fn()
+        else:
+            del board_flight.do
+
+        print(f"{name}: {args.rounds} rounds of {args.clients} concurrent requests...")
+        latencies = []
+        errors = [0]
+        loads[0] = 0
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            run_round(latencies, errors)
+        scenarios[name] = summarize(latencies, errors[0], time.perf_counter() - started)
+        board_loads[name] = loads[0]
+
+    print_scenarios(scenarios)
+    for name, count in board_loads.items():
+        print(f"{name}: {count} board loads for {args.rounds * args.clients} requests")
+
+    output = write_results('stampede', {
+        'parameters': {
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'clients': args.clients,
+            'rounds': args.rounds,
+            'categories': args.categories,
+            'clues': args.clues
+        },
+        'scenarios': scenarios,
+        'board_loads': board_loads,
+        'single_flight': board_flight.stats()
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
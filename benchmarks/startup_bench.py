@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for GracefulTable Jeopardy.
+
+Starts a fresh Python process per run and measures how long it takes to
+import the application module, build the app and answer a first request,
+which is what a new gunicorn worker or a serverless cold start pays.
+
+    python benchmarks/startup_bench.py --runs 20
+    python benchmarks/startup_bench.py --entrypoint wsgi --path /api/games
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, summarize, write_results
+
+# Runs in the child process; prints phase timestamps as JSON
+CHILD = '''
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+app = {factory}
+t2 = time.perf_counter()
+response = app.test_client().get({path!r})
+t3 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "create_app": t2 - t1, "first_response": t3 - t2,
+                  "status": response.status_code, "modules": len(sys.modules)}}))
+'''
+
+
+def run_once(entrypoint, path, env):
+    if entrypoint == 'wsgi':
+        code = CHILD.format(module='wsgi', factory='wsgi.app', path=path)
+    else:
+        code = CHILD.format(module='app', factory='app.create_app()', path=path)
+
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                               capture_output=True, text=True)
+    total = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip())
+
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    phases['process_total'] = total
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--entrypoint', choices=['app', 'wsgi'], default='wsgi',
+                        help='import app.create_app() or the gunicorn wsgi:app module')
+    parser.add_argument('--path', default='/api/health', help='first request to issue')
+    parser.add_argument('--database-url', help='database to use (default: temporary SQLite file)')
+    parser.add_argument('--output', help='results file (default: bench_results/startup-<timestamp>.json)')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.database_url:
+        env['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-startup-', suffix='.db')
+        os.close(fd)
+        env['DATABASE_URL'] = f'sqlite:///{path}'
+
+    samples = []
+    for i in range(args.runs):
+        sample = run_once(args.entrypoint, args.path, env)
+        if sample['status'] >= 500:
+            print(f"Warning: first request returned {sample['status']}")
+        samples.append(sample)
+
+    phases = {}
+    print(f"\n{'phase':<16} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for phase in ('import', 'create_app', 'first_response', 'process_total'):
+        summary = summarize([sample[phase] for sample in samples], 0, sum(sample[phase] for sample in samples))
+        phases[phase] = summary['latency_ms']
+        print(f"{phase:<16} {phases[phase]['p50']:>9} {phases[phase]['p95']:>9} {phases[phase]['max']:>9}")
+    print(f"modules loaded: {samples[-1]['modules']}")
+
+    output = write_results('startup', {
+        'parameters': {
+            'runs': args.runs,
+            'entrypoint': args.entrypoint,
+            'path': args.path,
+            'database': env['DATABASE_URL'].split(':', 1)[0]
+        },
+        'phases': phases,
+        'modules_loaded': samples[-1]['modules']
+    }, args.output)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
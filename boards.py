@@ -0,0 +1,485 @@
+"""
+Board and game data-access helpers for GracefulTable Jeopardy.
+
+A "board" is a game together with its categories and clues - the nested
+structure produced by Game.to_dict() and consumed by game.js.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import joinedload
+
+from models import db, Game, Category, Clue, GameInstance, Player, GuestAnswer, SessionGuest, LegacyImport
+
+
+class BoardValidationError(ValueError):
+    """Raised when a submitted board does not have the Game.to_dict() shape."""
+
+
+def parse_id(value):
+    """Convert a URL id to an int, returning None if it is not numeric."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def board_load_options():
+    """Loader options that fetch a whole board in a fixed number of statements.
+
+    Categories are joined onto the game row and all clues are fetched with a
+    single SELECT ... WHERE category_id IN (...), so a board costs two
+    statements no matter how many categories it has. Ordering comes from the
+    relationship definitions (categories by position, clues by value).
+    """
+    return [joinedload(Game.categories).selectinload(Category.clues)]
+
+
+def load_board(game_id):
+    """Load a game with its categories and clues eagerly, or None if missing."""
+    game_id = parse_id(game_id)
+    if game_id is None:
+        return None
+
+    return db.session.get(Game, game_id, options=board_load_options())
+
+
+def board_version_query(game_id):
+    return select(Game.updated).where(Game.id == game_id)
+
+
+def get_board_version(game_id):
+    """Return the game's updated timestamp as a (found, updated) pair.
+
+    This is a single-column primary key lookup, cheap enough to run on every
+    board read to validate cached copies.
+    """
+    row = db.session.execute(board_version_query(game_id)).first()
+    if row is None:
+        return False, None
+    return True, row.updated
+
+
+def touch_game(game_id):
+    """Bump Game.updated so cached copies of the board are invalidated."""
+    db.session.execute(
+        update(Game).where(Game.id == game_id).values(updated=datetime.now())
+    )
+
+
+def _require_text(data, key, label):
+    value = data.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise BoardValidationError(f'{label} is required')
+    return value
+
+
+def validate_title(title):
+    """Validate a game title sent without a board, by the same rule validate_board applies."""
+    return _require_text({'title': title}, 'title', 'Title')
+
+
+def validate_board(data):
+    """Validate a nested board and return a normalized copy.
+
+    Accepts the shape emitted by Game.to_dict(). Clue values may be strings
+    (as sent by the creator form) and are converted to ints; category
+    positions follow list order. Ids are kept when present so callers can
+    match submitted rows against existing ones.
+    """
+    if not isinstance(data, dict):
+        raise BoardValidationError('Board must be a JSON object')
+
+    categories = data.get('categories', [])
+    if not isinstance(categories, list):
+        raise BoardValidationError('categories must be a list')
+
+    board = {
+        'title': validate_title(data.get('title')),
+        'categories': []
+    }
+
+    for position, category_data in enumerate(categories):
+        if not isinstance(category_data, dict):
+            raise BoardValidationError(f'Category {position} must be an object')
+
+        clues = category_data.get('clues', [])
+        if not isinstance(clues, list):
+            raise BoardValidationError(f'Clues for category {position} must be a list')
+
+        category = {
+            'id': parse_id(category_data.get('id')),
+            'title': _require_text(category_data, 'title', f'Title for category {position}'),
+            'position': position,
+            'clues': []
+        }
+
+        for index, clue_data in enumerate(clues):
+            if not isinstance(clue_data, dict) or not all(k in clue_data for k in ('value', 'answer', 'question')):
+                raise BoardValidationError(
+                    f'Value, answer, and question are required (category {position}, clue {index})')
+
+            try:
+                value = int(clue_data['value'])
+            except (ValueError, TypeError):
+                raise BoardValidationError(f"Invalid value format: {clue_data['value']} - must be an integer")
+
+            category['clues'].append({
+                'id': parse_id(clue_data.get('id')),
+                'value': value,
+                'answer': str(clue_data['answer']),
+                'question': str(clue_data['question']),
+                'status': clue_data.get('status') or 'unused'
+            })
+
+        board['categories'].append(category)
+
+    return board
+
+
+def insert_categories(game_id, categories):
+    """Bulk insert categories and their clues for a game.
+
+    Returns [(category_id, [clue_id, ...]), ...] in submission order; the
+    caller owns the transaction.
+    """
+    return insert_categories_many([(game_id, categories)])[0]
+
+
+def insert_categories_many(items):
+    """Bulk insert categories and clues for several games at once.
+
+    items is [(game_id, categories), ...]. Issues one multi-row INSERT for
+    all categories and one for all of their clues. Returned ids are matched
+    back by game and position rather than by row order, so no backend has to
+    fall back to row-at-a-time inserts. Returns one insert_categories()
+    result per item; the caller owns the transaction.
+    """
+    category_rows = [{
+        'game_id': game_id,
+        'title': category['title'],
+        'position': category['position']
+    } for game_id, categories in items for category in categories]
+    if not category_rows:
+        return [[] for _ in items]
+
+    rows = db.session.execute(
+        insert(Category).returning(Category.id, Category.game_id, Category.position),
+        category_rows
+    ).all()
+    ids_by_position = {(row.game_id, row.position): row.id for row in rows}
+
+    clue_rows = []
+    clue_ids = {}
+    for game_id, categories in items:
+        for category in categories:
+            category_id = ids_by_position[(game_id, category['position'])]
+            clue_ids[category_id] = []
+            for clue in category['clues']:
+                clue_rows.append({
+                    'category_id': category_id,
+                    'value': clue['value'],
+                    'answer': clue['answer'],
+                    'question': clue['question'],
+                    'status': clue['status']
+                })
+
+    if clue_rows:
+        for row in db.session.execute(insert(Clue).returning(Clue.id, Clue.category_id), clue_rows):
+            clue_ids[row.category_id].append(row.id)
+
+    return [[
+        (ids_by_position[(game_id, category['position'])],
+         sorted(clue_ids[ids_by_position[(game_id, category['position'])]]))
+        for category in categories
+    ] for game_id, categories in items]
+
+
+def insert_board(board):
+    """Insert a validated board and return the new Game and created ids.
+
+    Everything is flushed inside the current transaction; the caller commits.
+    """
+    game = Game(title=board['title'])
+    db.session.add(game)
+    db.session.flush()
+
+    return game, insert_categories(game.id, board['categories'])
+
+
+def insert_boards(boards):
+    """Insert several validated boards and return their new game ids in order.
+
+    Boards may carry 'created' and 'updated' datetimes to preserve. Costs one
+    multi-row INSERT for all games plus two for all categories and clues
+    together. SQLite cannot promise RETURNING order, so there SQLAlchemy
+    sends the game rows one at a time (cheap in-process); PostgreSQL gets a
+    single statement. The caller owns the transaction.
+    """
+    if not boards:
+        return []
+
+    # Every row needs the same keys to go out as one statement, so fill the defaults here
+    now = datetime.now()
+    game_rows = [{
+        'title': board['title'],
+        'created': board.get('created') or now,
+        'updated': board.get('updated') or now
+    } for board in boards]
+    # sort_by_parameter_order matches the returned ids to game_rows by position
+    game_ids = db.session.execute(
+        insert(Game).returning(Game.id, sort_by_parameter_order=True), game_rows
+    ).scalars().all()
+
+    insert_categories_many([(game_id, board['categories']) for game_id, board in zip(game_ids, boards)])
+    return game_ids
+
+
+class BoardConflictError(Exception):
+    """Raised when a board was changed since the client loaded it."""
+
+
+def claim_game_version(game_id, expected_updated, title=None):
+    """Atomically bump Game.updated if it still equals expected_updated.
+
+    This is the optimistic concurrency check for board saves: the compare and
+    the write happen in one UPDATE, so two editors saving the same version
+    cannot both succeed.
+    """
+    values = {'updated': datetime.now()}
+    if title is not None:
+        values['title'] = title
+
+    if expected_updated is None:
+        version_matches = Game.updated.is_(None)
+    else:
+        version_matches = Game.updated == expected_updated
+
+    result = db.session.execute(
+        update(Game).where(Game.id == game_id, version_matches).values(**values)
+    )
+    if result.rowcount != 1:
+        raise BoardConflictError('Game was modified since it was loaded')
+
+
+def apply_board_diff(game, board):
+    """Make the stored categories and clues of a game match a validated board.
+
+    Submitted rows carrying the id of an existing category or clue of this
+    game are updated in place (only when something changed); rows without a
+    known id are bulk inserted; existing rows missing from the board are
+    removed with set-based deletes. Primary keys of unchanged rows survive.
+    The caller owns the transaction.
+    """
+    existing_categories = {category.id: category for category in game.categories}
+    existing_clues = {clue.id: clue for category in game.categories for clue in category.clues}
+
+    kept_category_ids = set()
+    kept_clue_ids = set()
+    new_categories = []
+    new_clues = []
+
+    for category_data in board['categories']:
+        category = existing_categories.get(category_data['id'])
+        if category is None or category.id in kept_category_ids:
+            new_categories.append(category_data)
+            continue
+
+        kept_category_ids.add(category.id)
+        if category.title != category_data['title']:
+            category.title = category_data['title']
+        if category.position != category_data['position']:
+            category.position = category_data['position']
+
+        for clue_data in category_data['clues']:
+            clue = existing_clues.get(clue_data['id'])
+            if clue is None or clue.id in kept_clue_ids:
+                new_clues.append(dict(clue_data, category_id=category.id))
+                continue
+
+            kept_clue_ids.add(clue.id)
+            # Clues may also move between categories of the same game
+            for field in ('category_id', 'value', 'answer', 'question', 'status'):
+                value = category.id if field == 'category_id' else clue_data[field]
+                if getattr(clue, field) != value:
+                    setattr(clue, field, value)
+
+    # Write updates first so clues moved out of a removed category are not deleted with it
+    db.session.flush()
+
+    removed_clue_ids = [clue_id for clue_id in existing_clues if clue_id not in kept_clue_ids]
+    removed_category_ids = [category_id for category_id in existing_categories
+                            if category_id not in kept_category_ids]
+
+    if removed_clue_ids:
+        db.session.execute(
+            delete(Clue).where(Clue.id.in_(removed_clue_ids)),
+            execution_options={'synchronize_session': False}
+        )
+    if removed_category_ids:
+        db.session.execute(
+            delete(Category).where(Category.id.in_(removed_category_ids)),
+            execution_options={'synchronize_session': False}
+        )
+
+    if new_clues:
+        db.session.execute(insert(Clue), [{
+            'category_id': clue['category_id'],
+            'value': clue['value'],
+            'answer': clue['answer'],
+            'question': clue['question'],
+            'status': clue['status']
+        } for clue in new_clues])
+
+    insert_categories(game.id, new_categories)
+
+
+# Keep IN (...) lists below SQLite's historical 999 bound-parameter limit
+DELETE_CHUNK_SIZE = 500
+
+
+def delete_games(game_ids):
+    """Delete games and everything that hangs off them with set-based DELETEs.
+
+    Issues a fixed number of statements per chunk of ids instead of loading
+    every category and clue into the session. Returns the ids that existed
+    and were deleted, and the ids of their sessions (GameInstances) so live
+    session state can be dropped. The caller owns the transaction.
+    """
+    deleted = []
+    deleted_instances = []
+    game_ids = list(dict.fromkeys(game_ids))
+
+    for start in range(0, len(game_ids), DELETE_CHUNK_SIZE):
+        chunk = db.session.scalars(
+            select(Game.id).where(Game.id.in_(game_ids[start:start + DELETE_CHUNK_SIZE]))
+        ).all()
+        if not chunk:
+            continue
+
+        instance_ids = select(GameInstance.id).where(GameInstance.game_id.in_(chunk))
+        deleted_instances.extend(db.session.scalars(instance_ids))
+        category_ids = select(Category.id).where(Category.game_id.in_(chunk))
+
+        for statement in (
+            delete(Player).where(Player.game_instance_id.in_(instance_ids)),
+            delete(GuestAnswer).where(GuestAnswer.game_instance_id.in_(instance_ids)),
+            delete(SessionGuest).where(SessionGuest.game_instance_id.in_(instance_ids)),
+            delete(GameInstance).where(GameInstance.game_id.in_(chunk)),
+            # Keep import records so a re-run does not bring deleted legacy boards back
+            update(LegacyImport).where(LegacyImport.game_id.in_(chunk)).values(game_id=None),
+            delete(Clue).where(Clue.category_id.in_(category_ids)),
+            delete(Category).where(Category.game_id.in_(chunk)),
+            delete(Game).where(Game.id.in_(chunk)),
+        ):
+            db.session.execute(statement, execution_options={'synchronize_session': False})
+
+        deleted.extend(chunk)
+
+    return deleted, deleted_instances
+
+
+def delete_category_rows(game_id, category_id):
+    """Delete one category of a game and its clues; returns False if not found."""
+    category_ids = select(Category.id).where(Category.id == category_id, Category.game_id == game_id)
+    db.session.execute(
+        delete(Clue).where(Clue.category_id.in_(category_ids)),
+        execution_options={'synchronize_session': False}
+    )
+    result = db.session.execute(
+        delete(Category).where(Category.id == category_id, Category.game_id == game_id),
+        execution_options={'synchronize_session': False}
+    )
+    return result.rowcount > 0
+
+
+def clear_boards(game_ids):
+    """Delete every category and clue of the given games, keeping the games.
+
+    The caller owns the transaction.
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+    for start in range(0, len(game_ids), DELETE_CHUNK_SIZE):
+        chunk = game_ids[start:start + DELETE_CHUNK_SIZE]
+        category_ids = select(Category.id).where(Category.game_id.in_(chunk))
+        for statement in (
+            delete(Clue).where(Clue.category_id.in_(category_ids)),
+            delete(Category).where(Category.game_id.in_(chunk)),
+        ):
+            db.session.execute(statement, execution_options={'synchronize_session': False})
+
+
+def encode_cursor(created, game_id):
+    """Encode a (created, id) keyset position as an opaque URL-safe token."""
+    raw = json.dumps([created.isoformat() if created else None, game_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor(); raises ValueError if malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created, game_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created), int(game_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f'Invalid cursor: {token}') from e
+
+
+def game_list_version_query():
+    """Count, newest id and newest update of all games; any add, edit or delete changes one."""
+    return select(func.count(Game.id), func.max(Game.id), func.max(Game.updated))
+
+
+def game_page_query(limit, cursor=None, descending=False, title_prefix=None):
+    """Build the list_game_page() select; it fetches limit + 1 rows."""
+    key = tuple_(Game.created, Game.id)
+    query = select(Game.id, Game.title, Game.created)
+
+    if title_prefix:
+        query = query.where(Game.title.startswith(title_prefix, autoescape=True))
+
+    if cursor is not None:
+        position = tuple_(*decode_cursor(cursor))
+        query = query.where(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(Game.created.desc(), Game.id.desc())
+    else:
+        query = query.order_by(Game.created, Game.id)
+
+    # Fetch one extra row to learn whether another page exists
+    return query.limit(limit + 1)
+
+
+def game_page(rows, limit):
+    """Split rows from game_page_query() into (rows, next_cursor)."""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created, last.id)
+
+
+def list_game_page(limit, cursor=None, descending=False, title_prefix=None):
+    """Fetch one page of game summaries using keyset pagination.
+
+    Only id, title and created are selected, as plain rows, ordered on the
+    (created, id) index. Returns (rows, next_cursor) where next_cursor is
+    None on the last page.
+    """
+    query = game_page_query(limit, cursor=cursor, descending=descending, title_prefix=title_prefix)
+    return game_page(db.session.execute(query).all(), limit)
+
+
+def count_rows():
+    """Count games, categories and clues in a single round trip."""
+    row = db.session.execute(select(
+        select(func.count()).select_from(Game).scalar_subquery().label('game_count'),
+        select(func.count()).select_from(Category).scalar_subquery().label('category_count'),
+        select(func.count()).select_from(Clue).scalar_subquery().label('clue_count')
+    )).one()
+    return dict(row._mapping)
@@ -0,0 +1,219 @@
+"""
+In-process caches for GracefulTable Jeopardy.
+
+Each gunicorn worker keeps its own copies. Board entries are validated
+against Game.updated so a write served by another worker is never returned
+stale; aggregate counts are bounded by a TTL instead. Concurrent misses for
+the same board are coalesced into a single load by board_flight.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class BoardCache:
+    """Size-bounded LRU cache of pre-encoded boards.
+
+    Entries are stored per game id together with the Game.updated value they
+    were built from. A lookup only hits when the caller's updated value
+    matches, which makes (game_id, updated) the effective cache key while
+    still allowing a game's entry to be dropped in O(1) on writes.
+
+    Each entry holds one body per variant: 'json' plus any other encodings
+    of the same board version, such as 'json.gzip' or 'msgpack.br'.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, game_id, updated, variant='json'):
+        with self._lock:
+            entry = self._entries.get(game_id)
+            body = entry[1].get(variant) if entry is not None and entry[0] == updated else None
+            if body is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(game_id)
+            self.hits += 1
+            return body
+
+    def put(self, game_id, updated, body, variant='json'):
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None and entry[0] == updated:
+                entry[1][variant] = body
+            else:
+                self._entries[game_id] = (updated, {variant: body})
+            self._entries.move_to_end(game_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, game_id):
+        with self._lock:
+            if self._entries.pop(game_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'variants': sum(len(entry[1]) for entry in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+board_cache = BoardCache(max_size=int(os.environ.get('BOARD_CACHE_SIZE', 256)))
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one.
+
+    The first caller for a key runs the function. Callers that arrive while
+    it is still running wait for its result (or exception) instead of
+    repeating the work. Nothing is kept once the call finishes, so only
+    overlapping calls are merged; caching the result is up to the caller.
+
+    do() serves threads and greenlets. do_async() serves coroutines on an
+    event loop, where waiting on a threading.Event would block the loop.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, coroutine_fn):
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                # A task of its own, so a cancelled leader doesn't cancel its waiters
+                task = self._tasks[key] = asyncio.ensure_future(coroutine_fn())
+                task.add_done_callback(lambda _: self._tasks.pop(key, None))
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls) + len(self._tasks),
+                'calls': self.calls,
+                'coalesced': self.coalesced
+            }
+
+
+# Board loads, keyed by (game_id, updated, format)
+board_flight = SingleFlight()
+
+
+class StatsCache:
+    """Caches table counts for the status widgets.
+
+    Counts are recomputed when they are older than ttl seconds or after a
+    write has called invalidate(). Only one thread recomputes at a time;
+    concurrent readers keep getting the previous value meanwhile.
+    """
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._counts = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def get(self, loader):
+        """Return (counts, age_seconds), calling loader() to refresh if needed."""
+        with self._lock:
+            counts, loaded_at, stale = self._counts, self._loaded_at, self._stale
+
+        now = time.monotonic()
+        if counts is not None and not stale and now - loaded_at < self.ttl:
+            return counts, now - loaded_at
+
+        # Let a single caller refresh; others fall back to the previous counts
+        if not self._refresh_lock.acquire(blocking=counts is None):
+            return counts, now - loaded_at
+
+        try:
+            with self._lock:
+                self._stale = False
+            counts = loader()
+            with self._lock:
+                self._counts = counts
+                self._loaded_at = time.monotonic()
+            return counts, 0.0
+        except Exception:
+            with self._lock:
+                self._stale = True
+            raise
+        finally:
+            self._refresh_lock.release()
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+
+stats_cache = StatsCache(ttl=float(os.environ.get('STATS_CACHE_TTL', 30)))
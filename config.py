@@ -0,0 +1,80 @@
+"""
+Environment-driven configuration for GracefulTable Jeopardy.
+"""
+
+import os
+
+from metrics import InstrumentedQueuePool
+
+
+def database_url_from_env():
+    database_url = os.environ.get('DATABASE_URL', 'sqlite:///jeopardy.db')
+
+    # Fix for PostgreSQL URI format and specify psycopg3 driver
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql+psycopg://', 1)
+    elif database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+psycopg://', 1)
+
+    return database_url
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, '') else int(value)
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def engine_options_from_env(database_url):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from DB_* environment variables.
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW     connections kept open / allowed on top
+    DB_POOL_TIMEOUT                    seconds to wait for a free connection
+    DB_POOL_RECYCLE                    reconnect connections older than this
+    DB_POOL_PRE_PING                   test connections on checkout (default on)
+    DB_PREPARE_THRESHOLD               psycopg3 prepare_threshold; 'none'
+                                       disables server-side prepared
+                                       statements (needed behind PgBouncer in
+                                       transaction mode)
+    """
+    # In-memory SQLite lives inside a single connection, so leave its pool alone
+    if database_url.startswith('sqlite') and ':memory:' in database_url:
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True)
+    }
+
+    if database_url.startswith('postgresql+psycopg'):
+        threshold = os.environ.get('DB_PREPARE_THRESHOLD')
+        if threshold:
+            options['connect_args'] = {
+                'prepare_threshold': None if threshold.lower() == 'none' else int(threshold)
+            }
+
+    return options
+
+
+def async_database_url(database_url):
+    """The asyncio driver URL for asgi.py: psycopg 3 runs async as is, SQLite needs aiosqlite."""
+    if database_url.startswith('sqlite:'):
+        return database_url.replace('sqlite:', 'sqlite+aiosqlite:', 1)
+    return database_url
+
+
+def async_engine_options_from_env(database_url):
+    """The same DB_* pool settings, on SQLAlchemy's asyncio-adapted pool."""
+    options = engine_options_from_env(database_url)
+    options.pop('poolclass', None)
+    return options
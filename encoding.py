@@ -0,0 +1,150 @@
+"""
+Response encodings for GracefulTable Jeopardy.
+
+Two things are negotiated here:
+
+* Content-Encoding: JSON and other text responses of at least
+  COMPRESS_MIN_SIZE bytes are compressed with brotli (if installed) or gzip,
+  whichever the client's Accept-Encoding prefers. Boards go through
+  board_body()/put_board(), which keep the compressed bytes in the board
+  cache next to the plain ones, so a board is compressed once per version
+  rather than once per request. Everything else is compressed on the way out
+  by an after_request hook.
+
+* Board format: a client sending `Accept: application/msgpack` gets the
+  board as MessagePack positional arrays instead of JSON objects (if msgpack
+  is installed), with integer ids and no repeated keys:
+
+      [id, title, created, updated, [category, ...]]
+      category: [id, title, position, [clue, ...]]
+      clue:     [id, value, answer, question, status]
+
+Compressed responses carry a weak ETag, since their bytes differ from the
+plain representation; the conditional GET helpers compare ETags weakly.
+"""
+
+import gzip
+import os
+
+from flask import request
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from cache import board_cache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; boards are then always JSON
+    msgpack = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5))
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack', 'application/javascript', 'image/svg+xml')
+
+BOARD_TYPES = {'json': 'application/json', 'msgpack': 'application/msgpack'}
+
+
+def accepted_encoding(header):
+    """Pick 'br', 'gzip' or None for an Accept-Encoding header value."""
+    accept = parse_accept_header(header)
+    choices = [('br', accept.quality('br'))] if brotli is not None else []
+    choices.append(('gzip', accept.quality('gzip')))
+    encoding, quality = max(choices, key=lambda choice: choice[1])
+    return encoding if quality > 0 else None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def board_format(header):
+    """'msgpack' when the Accept header prefers it and msgpack is installed, else 'json'."""
+    if msgpack is None or not header:
+        return 'json'
+    best = parse_accept_header(header, MIMEAccept).best_match(['application/json', 'application/msgpack'])
+    return 'msgpack' if best == 'application/msgpack' else 'json'
+
+
+def pack_board(game):
+    """Encode a loaded board as MessagePack positional arrays."""
+    return msgpack.packb([
+        game.id,
+        game.title,
+        game.created.isoformat(),
+        game.updated.isoformat() if game.updated else None,
+        [[
+            category.id,
+            category.title,
+            category.position,
+            [[clue.id, clue.value, clue.answer, clue.question, clue.status] for clue in category.clues]
+        ] for category in game.categories]
+    ])
+
+
+def board_body(game_id, updated, fmt, encoding):
+    """Return cached (body, applied encoding) for a board, or (None, None) on a miss.
+
+    A missing compressed variant is built from the cached plain body.
+    """
+    if encoding:
+        body = board_cache.get(game_id, updated, f'{fmt}.{encoding}')
+        if body is not None:
+            return body, encoding
+
+    plain = board_cache.get(game_id, updated, fmt)
+    if plain is None:
+        return None, None
+    return put_board(game_id, updated, fmt, plain, encoding, cached=True)
+
+
+def put_board(game_id, updated, fmt, plain, encoding, cached=False):
+    """Cache a freshly encoded board and return (body, applied encoding)."""
+    if not cached:
+        board_cache.put(game_id, updated, plain, fmt)
+    if not encoding or len(plain) < COMPRESS_MIN_SIZE:
+        return plain, None
+
+    body = compress(plain, encoding)
+    board_cache.put(game_id, updated, body, f'{fmt}.{encoding}')
+    return body, encoding
+
+
+def compress_response(response):
+    """after_request hook compressing large, non-streamed text responses."""
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not response.mimetype.startswith('text/') and response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    if response.content_length is not None and response.content_length < COMPRESS_MIN_SIZE:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    weaken_etag(response)
+    return response
+
+
+def weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -0,0 +1,158 @@
+"""
+Streaming NDJSON export of the game library.
+
+Boards are read with a single ordered games/categories/clues join fetched
+in batches through a server-side cursor (yield_per), and written one game
+per line. Only the game currently being assembled is held in memory, so
+the export runs in constant memory regardless of library size.
+"""
+
+import gzip
+import json
+import sys
+import zlib
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+from models import db, Game, Category, Clue
+
+# Rows fetched per round trip, and the size of chunks handed to the server
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def parse_updated_since(value):
+    """Parse an ISO 8601 timestamp for incremental exports; None passes through."""
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Invalid updated_since: {value} - must be an ISO 8601 timestamp')
+
+
+def iter_export_games(updated_since=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield one board dict per game, in id order, shaped like Game.to_dict()."""
+    stmt = (
+        db.select(Game.id, Game.title, Game.created, Game.updated,
+                  Category.id, Category.title, Category.position,
+                  Clue.id, Clue.value, Clue.answer, Clue.question, Clue.status)
+        .select_from(Game)
+        .outerjoin(Category, Category.game_id == Game.id)
+        .outerjoin(Clue, Clue.category_id == Category.id)
+        .order_by(Game.id, Category.position, Category.id, Clue.value, Clue.id)
+    )
+    if updated_since is not None:
+        stmt = stmt.where(Game.updated >= updated_since)
+
+    game = None
+    category = None
+    # Plain column rows, so nothing accumulates in the session's identity map
+    for row in db.session.execute(stmt.execution_options(yield_per=batch_size)):
+        (game_id, game_title, created, updated,
+         category_id, category_title, position,
+         clue_id, value, answer, question, status) = row
+
+        if game is None or game['id'] != game_id:
+            if game is not None:
+                yield game
+            game = {
+                'id': game_id,
+                'title': game_title,
+                'created': created.isoformat(),
+                'updated': updated.isoformat() if updated else None,
+                'categories': []
+            }
+            category = None
+
+        if category_id is not None and (category is None or category['id'] != str(category_id)):
+            category = {
+                'id': str(category_id),
+                'title': category_title,
+                'position': position,
+                'clues': []
+            }
+            game['categories'].append(category)
+
+        if clue_id is not None:
+            category['clues'].append({
+                'id': str(clue_id),
+                'value': value,
+                'answer': answer,
+                'question': question,
+                'status': status
+            })
+
+    if game is not None:
+        yield game
+
+
+def iter_ndjson(games, chunk_bytes=EXPORT_CHUNK_BYTES):
+    """Encode games as NDJSON, coalescing lines into chunks of about chunk_bytes."""
+    buffer = []
+    size = 0
+    for game in games:
+        line = json.dumps(game, separators=(',', ':')).encode('utf-8') + b'\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@click.command('export-games')
+@click.option('--output', '-o', default='-', help='File to write, or - for stdout. A .gz suffix implies --gzip.')
+@click.option('--updated-since', help='Only export games updated at or after this ISO 8601 timestamp.')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip the output.')
+@click.option('--batch-size', default=EXPORT_BATCH_SIZE, show_default=True, help='Rows fetched per round trip.')
+@with_appcontext
+def export_games_command(output, updated_since, compress, batch_size):
+    """Export every game as NDJSON, one board per line."""
+    try:
+        since = parse_updated_since(updated_since)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--updated-since')
+
+    compress = compress or output.endswith('.gz')
+    if output == '-':
+        stream = gzip.GzipFile(fileobj=sys.stdout.buffer, mode='wb') if compress else sys.stdout.buffer
+    else:
+        stream = gzip.open(output, 'wb') if compress else open(output, 'wb')
+
+    count = 0
+    newest = None
+
+    def tracked(games):
+        nonlocal count, newest
+        for game in games:
+            count += 1
+            if game['updated'] and (newest is None or game['updated'] > newest):
+                newest = game['updated']
+            yield game
+
+    try:
+        for chunk in iter_ndjson(tracked(iter_export_games(since, batch_size))):
+            stream.write(chunk)
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        else:
+            stream.flush()
+
+    # Pass the newest timestamp as --updated-since on the next incremental run
+    click.echo(f'Exported {count} games' + (f'; newest update {newest}' if newest else ''), err=True)
@@ -0,0 +1,495 @@
+"""
+Server-side game sessions for GracefulTable Jeopardy.
+
+A session is a GameInstance with its players. While a game is being played
+its live state - which clues are used, the scores and whose turn it is -
+is kept in memory in a compact GameSession, and events are applied to it
+in O(1). Used clues belong to the session, not to the board: they are
+stored as a bitset on GameInstance, so sessions never write to the shared
+clues rows and starting a new game on a board costs nothing. A background
+thread writes the changes behind in batched transactions every
+SESSION_FLUSH_INTERVAL seconds (or sooner when many events are pending),
+instead of committing once per buzz.
+
+Sessions live in the worker process that created or loaded them. Another
+worker (or the same one after a restart) reloads a session from the
+database, which is at most one flush interval behind, so deployments that
+run several workers should route a session's requests to one worker.
+"""
+
+import atexit
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, select, update
+
+from models import db, Category, Clue, GameInstance, Player
+
+
+class SessionError(ValueError):
+    """Raised when an event does not apply to a session."""
+
+
+class GameSession:
+    """Live state of one GameInstance.
+
+    Usage is a single int used as a bitset over the board's clues in board
+    order: clue_order[n] is the clue id of bit n and clue_bits maps it back,
+    so a 30-clue board needs 30 bits whatever its clue ids are. The order is
+    persisted with the session and only ever appended to: clues added to the
+    board during a game get the next bits and deleted clues keep theirs, so
+    no bit is ever renumbered. Scores are a list indexed like the players.
+    The dirty_* fields record what changed since the last flush.
+    """
+
+    __slots__ = ('id', 'game_id', 'clue_order', 'clue_bits', 'used', 'player_ids', 'player_names',
+                 'scores', 'current_player', 'open_clue', 'opened_at', 'ended', 'version', 'last_access',
+                 'dirty_used', 'dirty_order', 'dirty_scores', 'dirty_ended', 'lock')
+
+    def __init__(self, instance_id, game_id, clue_order, player_ids, player_names, scores,
+                 used=0, ended=False):
+        self.id = instance_id
+        self.game_id = game_id
+        self.clue_order = list(clue_order)
+        self.clue_bits = {clue_id: bit for bit, clue_id in enumerate(self.clue_order)}
+        self.used = used
+        self.player_ids = list(player_ids)
+        self.player_names = list(player_names)
+        self.scores = list(scores)
+        self.current_player = 0
+        self.open_clue = None
+        self.opened_at = None
+        self.ended = ended
+        self.version = 0
+        self.last_access = time.monotonic()
+        self.dirty_used = False
+        self.dirty_order = False
+        self.dirty_scores = set()
+        self.dirty_ended = False
+        self.lock = threading.Lock()
+
+    def add_clues(self, clue_ids):
+        """Give clues added to the board after the session started the next bits."""
+        for clue_id in clue_ids:
+            if clue_id not in self.clue_bits:
+                self.clue_bits[clue_id] = len(self.clue_order)
+                self.clue_order.append(clue_id)
+                self.dirty_order = True
+
+    def select_clue(self, clue_id):
+        bit = self.clue_bits.get(clue_id)
+        if bit is None:
+            raise SessionError(f'Clue {clue_id} is not on this board')
+        mask = 1 << bit
+        if not self.used & mask:
+            self.used |= mask
+            self.dirty_used = True
+        self.open_clue = clue_id
+        self.opened_at = time.monotonic()
+
+    def add_score(self, player_index, delta):
+        if not 0 <= player_index < len(self.scores):
+            raise SessionError(f'Invalid player index: {player_index}')
+        self.scores[player_index] += delta
+        self.dirty_scores.add(player_index)
+
+    def set_turn(self, player_index):
+        if not 0 <= player_index < len(self.scores):
+            raise SessionError(f'Invalid player index: {player_index}')
+        self.current_player = player_index
+
+    def end(self):
+        if not self.ended:
+            self.ended = True
+            self.dirty_ended = True
+
+    def is_dirty(self):
+        return bool(self.dirty_used or self.dirty_order or self.dirty_scores or self.dirty_ended)
+
+    def used_clue_ids(self):
+        clue_ids = []
+        remaining = self.used
+        while remaining:
+            lowest = remaining & -remaining
+            clue_ids.append(self.clue_order[lowest.bit_length() - 1])
+            remaining ^= lowest
+        return clue_ids
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'game_id': self.game_id,
+            'players': [{
+                'id': player_id,
+                'name': name,
+                'score': score
+            } for player_id, name, score in zip(self.player_ids, self.player_names, self.scores)],
+            'used_clues': [str(clue_id) for clue_id in self.used_clue_ids()],
+            'current_player': self.current_player,
+            'ended': self.ended,
+            'version': self.version
+        }
+
+
+def encode_bitset(value):
+    """Pack an int bitset into little-endian bytes for GameInstance.used_clues."""
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def decode_bitset(data):
+    return int.from_bytes(data or b'', 'little')
+
+
+def encode_clue_order(clue_ids):
+    """Pack the bit -> clue id order for GameInstance.clue_order as little-endian uint32s."""
+    return struct.pack(f'<{len(clue_ids)}I', *clue_ids)
+
+
+def decode_clue_order(data):
+    return list(struct.unpack(f'<{len(data or b"") // 4}I', data or b''))
+
+
+def _parse_int(value, label):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise SessionError(f'{label} must be an integer')
+
+
+def _event_clue_id(event):
+    try:
+        return int(event.get('clue_id'))
+    except (TypeError, ValueError):
+        return None
+
+
+class SessionStore:
+    """Holds the live GameSessions of this worker and writes them behind."""
+
+    def __init__(self, flush_interval=2.0, max_pending=500, idle_ttl=3600):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.idle_ttl = idle_ttl
+        self.app = None
+        self._sessions = {}
+        self._dirty = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher = None
+        self._flush_hooks = []
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.last_flush_ms = None
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['game_sessions'] = self
+
+    def add_flush_hook(self, hook):
+        """Run hook() in an app context on every write-behind cycle, after flush()."""
+        self._flush_hooks.append(hook)
+
+    def _board_clue_ids(self, game_id):
+        """The board's clue ids in board order (category position, then value)."""
+        return db.session.scalars(
+            select(Clue.id).join(Category, Clue.category_id == Category.id).where(Category.game_id == game_id)
+            .order_by(Category.position, Category.id, Clue.value, Clue.id)
+        ).all()
+
+    def create(self, game_id, player_names):
+        """Start a new GameInstance with players; committed before returning."""
+        clue_order = self._board_clue_ids(game_id)
+
+        instance = GameInstance(game_id=game_id, used_clues=encode_bitset(0),
+                                clue_order=encode_clue_order(clue_order))
+        instance.players = [Player(name=name, score=0) for name in player_names]
+        db.session.add(instance)
+        db.session.commit()
+
+        session = GameSession(
+            instance.id, game_id, clue_order,
+            [player.id for player in instance.players], list(player_names), [0] * len(player_names)
+        )
+        with self._lock:
+            self._sessions[session.id] = session
+        self._ensure_flusher()
+        return session
+
+    def _load(self, instance_id):
+        instance = db.session.get(GameInstance, instance_id)
+        if instance is None:
+            return None
+
+        players = sorted(instance.players, key=lambda player: player.id)
+        session = GameSession(
+            instance.id, instance.game_id, decode_clue_order(instance.clue_order),
+            [player.id for player in players], [player.name for player in players],
+            [player.score or 0 for player in players],
+            used=decode_bitset(instance.used_clues), ended=instance.end_time is not None
+        )
+        # Clues added to the board while the session was not loaded
+        session.add_clues(self._board_clue_ids(instance.game_id))
+        return session
+
+    def refresh_clues(self, session):
+        """Pick up clues added to the board since the session was created or loaded."""
+        clue_ids = self._board_clue_ids(session.game_id)
+        with session.lock:
+            session.add_clues(clue_ids)
+            dirty = session.dirty_order
+        if dirty:
+            with self._lock:
+                self._dirty.add(session.id)
+
+    def get(self, instance_id):
+        """Return the live session, loading it from the database on a miss."""
+        with self._lock:
+            session = self._sessions.get(instance_id)
+        if session is None:
+            loaded = self._load(instance_id)
+            if loaded is None:
+                return None
+            with self._lock:
+                session = self._sessions.setdefault(instance_id, loaded)
+            self._ensure_flusher()
+        session.last_access = time.monotonic()
+        return session
+
+    def apply(self, session, events, publish=None):
+        """Apply a list of events atomically and return the resulting deltas.
+
+        Events are {'type': 'select_clue', 'clue_id': ...},
+        {'type': 'reveal', 'clue_id': ...},
+        {'type': 'score', 'player_index': ..., 'delta': ...},
+        {'type': 'turn', 'player_index': ...} and {'type': 'end'}. Raises
+        SessionError, leaving the state untouched, if any event is invalid.
+
+        Deltas are small messages for viewers carrying absolute values (the
+        new score rather than the change), so applying one twice is harmless.
+        publish(session.id, deltas) is called before the session lock is
+        released, so concurrent posts reach viewers in version order and an
+        older score never lands after a newer one.
+        """
+        # A clue the session has not seen may have been added to the board since it started
+        if any(isinstance(event, dict) and event.get('type') in ('select_clue', 'reveal')
+               and _event_clue_id(event) not in session.clue_bits for event in events):
+            self.refresh_clues(session)
+
+        with session.lock:
+            if session.ended:
+                raise SessionError('Session has ended')
+
+            # Validate everything first so a bad event leaves the state untouched
+            actions = []
+            for event in events:
+                if not isinstance(event, dict):
+                    raise SessionError('Each event must be an object')
+                kind = event.get('type')
+                if kind in ('select_clue', 'reveal'):
+                    clue_id = _parse_int(event.get('clue_id'), 'clue_id')
+                    if clue_id not in session.clue_bits:
+                        raise SessionError(f'Clue {clue_id} is not on this board')
+                    actions.append((kind, clue_id))
+                elif kind in ('score', 'turn'):
+                    index = _parse_int(event.get('player_index'), 'player_index')
+                    if not 0 <= index < len(session.scores):
+                        raise SessionError(f'Invalid player index: {index}')
+                    if kind == 'score':
+                        actions.append((kind, index, _parse_int(event.get('delta'), 'delta')))
+                    else:
+                        actions.append((kind, index))
+                elif kind == 'end':
+                    actions.append((kind,))
+                else:
+                    raise SessionError(f'Unknown event type: {kind}')
+
+            session.version += 1
+            deltas = []
+            for kind, *args in actions:
+                if kind == 'select_clue':
+                    session.select_clue(args[0])
+                    deltas.append({'type': 'clue', 'clue_id': str(args[0])})
+                elif kind == 'reveal':
+                    deltas.append({'type': 'reveal', 'clue_id': str(args[0])})
+                elif kind == 'score':
+                    session.add_score(*args)
+                    deltas.append({'type': 'score', 'player_index': args[0], 'score': session.scores[args[0]]})
+                elif kind == 'turn':
+                    session.set_turn(args[0])
+                    deltas.append({'type': 'turn', 'player_index': args[0]})
+                else:
+                    session.end()
+                    deltas.append({'type': 'game_over', 'scores': list(session.scores)})
+            for delta in deltas:
+                delta['version'] = session.version
+            if publish is not None:
+                publish(session.id, deltas)
+            dirty = session.is_dirty()
+            ended = session.ended
+
+        if dirty:
+            with self._lock:
+                self._dirty.add(session.id)
+                self._pending += len(events)
+                pending = self._pending
+            # Persist promptly at game over or when a lot has piled up
+            if ended or pending >= self.max_pending:
+                self.request_flush()
+        return deltas
+
+    def request_flush(self):
+        """Wake the write-behind thread now instead of at the next interval."""
+        self._wake.set()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run, name='game-session-flusher', daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush_all()
+            self._evict_idle()
+
+    def _flush_all(self):
+        with self.app.app_context():
+            for flush in [self.flush] + self._flush_hooks:
+                try:
+                    flush()
+                except Exception as e:
+                    print(f'Game session flush failed: {e}')
+
+    def flush(self):
+        """Write every pending change in one transaction; returns the rows written."""
+        with self._lock:
+            session_ids = list(self._dirty)
+            self._dirty.clear()
+            self._pending = 0
+            sessions = [self._sessions[session_id] for session_id in session_ids if session_id in self._sessions]
+        if not sessions:
+            return 0
+
+        # Take the dirty sets; they are merged back if the write fails
+        taken = []
+        score_rows = []
+        used_rows = []
+        order_rows = []
+        ended_ids = []
+        for session in sessions:
+            with session.lock:
+                dirty_used, dirty_order = session.dirty_used, session.dirty_order
+                dirty_scores, dirty_ended = session.dirty_scores, session.dirty_ended
+                session.dirty_used, session.dirty_order = False, False
+                session.dirty_scores, session.dirty_ended = set(), False
+                score_rows.extend({'player_id': session.player_ids[index], 'player_score': session.scores[index]}
+                                  for index in dirty_scores)
+                if dirty_used:
+                    used_rows.append({'instance_id': session.id, 'instance_used': encode_bitset(session.used)})
+                if dirty_order:
+                    order_rows.append({'instance_id': session.id,
+                                       'instance_order': encode_clue_order(session.clue_order)})
+                if dirty_ended:
+                    ended_ids.append(session.id)
+            taken.append((session, dirty_used, dirty_order, dirty_scores, dirty_ended))
+
+        start = time.perf_counter()
+        try:
+            if score_rows:
+                players = Player.__table__
+                db.session.execute(
+                    update(players).where(players.c.id == bindparam('player_id'))
+                    .values(score=bindparam('player_score')),
+                    score_rows
+                )
+            if used_rows:
+                instances = GameInstance.__table__
+                db.session.execute(
+                    update(instances).where(instances.c.id == bindparam('instance_id'))
+                    .values(used_clues=bindparam('instance_used')),
+                    used_rows
+                )
+            if order_rows:
+                instances = GameInstance.__table__
+                db.session.execute(
+                    update(instances).where(instances.c.id == bindparam('instance_id'))
+                    .values(clue_order=bindparam('instance_order')),
+                    order_rows
+                )
+            if ended_ids:
+                db.session.execute(
+                    update(GameInstance).where(GameInstance.id.in_(ended_ids)).values(end_time=datetime.now()),
+                    execution_options={'synchronize_session': False}
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for session, dirty_used, dirty_order, dirty_scores, dirty_ended in taken:
+                with session.lock:
+                    session.dirty_used = session.dirty_used or dirty_used
+                    session.dirty_order = session.dirty_order or dirty_order
+                    session.dirty_scores |= dirty_scores
+                    session.dirty_ended = session.dirty_ended or dirty_ended
+            with self._lock:
+                self._dirty.update(session.id for session, *_ in taken)
+                self.flush_errors += 1
+            raise
+
+        rows = len(score_rows) + len(used_rows) + len(order_rows) + len(ended_ids)
+        with self._lock:
+            self.flushes += 1
+            self.rows_written += rows
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 3)
+        return rows
+
+    def discard(self, instance_ids):
+        """Forget sessions whose GameInstance rows were deleted, without writing them."""
+        with self._lock:
+            for instance_id in instance_ids:
+                self._sessions.pop(instance_id, None)
+                self._dirty.discard(instance_id)
+
+    def _evict_idle(self):
+        """Drop clean sessions that have ended or gone idle; they reload on demand."""
+        now = time.monotonic()
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                if session_id in self._dirty or session.is_dirty():
+                    continue
+                if session.ended or now - session.last_access > self.idle_ttl:
+                    del self._sessions[session_id]
+
+    def shutdown(self):
+        """Flush whatever is pending; registered to run at interpreter exit."""
+        if self.app is not None:
+            self._flush_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'live': len(self._sessions),
+                'dirty': len(self._dirty),
+                'flush_interval': self.flush_interval,
+                'flushes': self.flushes,
+                'rows_written': self.rows_written,
+                'flush_errors': self.flush_errors,
+                'last_flush_ms': self.last_flush_ms
+            }
+
+
+session_store = SessionStore(
+    flush_interval=float(os.environ.get('SESSION_FLUSH_INTERVAL', 2)),
+    max_pending=int(os.environ.get('SESSION_FLUSH_MAX_PENDING', 500)),
+    idle_ttl=float(os.environ.get('SESSION_IDLE_TTL', 3600))
+)
+atexit.register(session_store.shutdown)
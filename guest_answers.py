@@ -0,0 +1,393 @@
+"""
+Guest answer ingestion for game sessions.
+
+When a clue closes, every guest phone submits at once. Submissions are
+accepted in memory: each session keeps a ring buffer of recent answers,
+a bitset per guest of the clues they have answered (so retries and double
+taps count once) and running tallies per clue and per guest. The host's
+responses and scores calls serve pre-encoded bodies that are only rebuilt
+after something changed, and joins and answers are written to
+session_guests and guest_answers in batches by the game session flusher
+rather than one commit per request.
+
+Answers are only accepted for the clue the host has open, within
+GUEST_ANSWER_WINDOW seconds of it being opened.
+
+That window is also the deduplication window. Rather than remembering
+when each guest last answered, a guest's first answer to a clue wins
+and later ones are acknowledged as duplicates for the rest of the
+session. Inside the window this behaves like time-windowed
+deduplication, and after it no answer is accepted anyway. The
+difference shows when the host reopens a clue: a guest cannot answer it
+a second time and score twice. A bit per clue is also all a guest
+costs, with no timestamps to keep or expire, and it is rebuilt from
+guest_answers when the state is reloaded.
+"""
+
+import os
+import re
+import secrets
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from flask import json
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+
+from game_sessions import SessionError, session_store
+from models import db, Category, Clue, GameInstance, GuestAnswer, SessionGuest
+
+_PREFIX = re.compile(r'^(what|who|where|when|which)\s+(is|are|was|were)\s+')
+_ARTICLE = re.compile(r'^(a|an|the)\s+')
+_NON_WORD = re.compile(r'[^a-z0-9 ]+')
+
+
+def normalize_answer(text):
+    """Lowercase, drop punctuation and a leading 'What is'/article for matching."""
+    text = _NON_WORD.sub(' ', text.lower())
+    text = ' '.join(text.split())
+    text = _PREFIX.sub('', text)
+    return _ARTICLE.sub('', text)
+
+
+class GuestState:
+    """Guests, tallies and unpersisted answers of one session."""
+
+    __slots__ = ('session_id', 'clues', 'guests', 'tallies', 'recent', 'pending', 'pending_guests',
+                 'flush_failures', 'version', 'bodies', 'last_access', 'lock')
+
+    def __init__(self, session_id, clues, ring_size):
+        self.session_id = session_id
+        # clue id -> (value, normalized correct response)
+        self.clues = clues
+        # guest id -> [name, score, correct count, answered clue bitset in the session's bit order]
+        self.guests = {}
+        # clue id -> [answers, correct, Counter of normalized answers]
+        self.tallies = {}
+        self.recent = deque(maxlen=ring_size)
+        self.pending = []
+        self.pending_guests = []
+        # Consecutive flushes that rejected this session's rows
+        self.flush_failures = 0
+        self.version = 0
+        self.bodies = {}
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    def tally(self, clue_id):
+        tally = self.tallies.get(clue_id)
+        if tally is None:
+            tally = self.tallies[clue_id] = [0, 0, Counter()]
+        return tally
+
+
+class AnswerStore:
+    def __init__(self, window=35.0, ring_size=256, max_pending=1000, max_retries=5, idle_ttl=3600):
+        self.window = window
+        self.ring_size = ring_size
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.idle_ttl = idle_ttl
+        self._states = {}
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+
+    def _board_clues(self, game_id):
+        # clue id -> (value, normalized correct response)
+        return {row.id: (row.value, normalize_answer(row.question)) for row in db.session.execute(
+            select(Clue.id, Clue.value, Clue.question)
+            .join(Category, Clue.category_id == Category.id)
+            .where(Category.game_id == game_id)
+        )}
+
+    def _load(self, session):
+        """Build a session's state, restoring guests and tallies from persisted joins and answers."""
+        state = GuestState(session.id, self._board_clues(session.game_id), self.ring_size)
+
+        for row in db.session.execute(
+            select(SessionGuest.guest_id, SessionGuest.name)
+            .where(SessionGuest.game_instance_id == session.id)
+            .order_by(SessionGuest.id)
+        ):
+            state.guests[row.guest_id] = [row.name, 0, 0, 0]
+
+        for row in db.session.execute(
+            select(GuestAnswer.guest_id, GuestAnswer.guest_name, GuestAnswer.clue_id, GuestAnswer.answer,
+                   GuestAnswer.correct, GuestAnswer.points)
+            .where(GuestAnswer.game_instance_id == session.id)
+            .order_by(GuestAnswer.id)
+        ):
+            guest = state.guests.setdefault(row.guest_id, [row.guest_name, 0, 0, 0])
+            guest[1] += row.points or 0
+            guest[2] += 1 if row.correct else 0
+            bit = session.clue_bits.get(row.clue_id)
+            if bit is not None:
+                guest[3] |= 1 << bit
+            tally = state.tally(row.clue_id)
+            tally[0] += 1
+            tally[1] += 1 if row.correct else 0
+            tally[2][normalize_answer(row.answer)] += 1
+        return state
+
+    def state(self, session):
+        with self._lock:
+            state = self._states.get(session.id)
+        if state is None:
+            loaded = self._load(session)
+            with self._lock:
+                state = self._states.setdefault(session.id, loaded)
+        state.last_access = time.monotonic()
+        return state
+
+    def join(self, session, name):
+        if session.ended:
+            raise SessionError('Session has ended')
+        state = self.state(session)
+        guest_id = secrets.token_urlsafe(9)
+        with state.lock:
+            state.guests[guest_id] = [name, 0, 0, 0]
+            state.pending_guests.append({
+                'game_instance_id': state.session_id,
+                'guest_id': guest_id,
+                'name': name,
+                'joined_at': datetime.now()
+            })
+            state.version += 1
+        return guest_id
+
+    def submit(self, session, guest_id, answer, clue_id=None):
+        """Record one answer in O(1); returns False if it duplicates an earlier one."""
+        with session.lock:
+            open_clue, opened_at, ended = session.open_clue, session.opened_at, session.ended
+        if clue_id is None:
+            clue_id = open_clue
+        if ended or clue_id is None or clue_id != open_clue or time.monotonic() - opened_at > self.window:
+            with self._lock:
+                self.rejected += 1
+            raise SessionError('Answers for this clue are closed')
+
+        state = self.state(session)
+        if clue_id not in state.clues:
+            # Added to the board after the state was loaded
+            clues = self._board_clues(session.game_id)
+            with state.lock:
+                state.clues.update(clues)
+        normalized = normalize_answer(answer)
+        mask = 1 << session.clue_bits[clue_id]
+        with state.lock:
+            guest = state.guests.get(guest_id)
+            if guest is None:
+                raise SessionError('Unknown guest; join the session first')
+
+            if guest[3] & mask:
+                duplicate = True
+            else:
+                duplicate = False
+                value, expected = state.clues.get(clue_id, (0, None))
+                correct = bool(normalized) and normalized == expected
+                points = value if correct else 0
+
+                guest[1] += points
+                guest[2] += 1 if correct else 0
+                guest[3] |= mask
+                tally = state.tally(clue_id)
+                tally[0] += 1
+                tally[1] += 1 if correct else 0
+                tally[2][normalized] += 1
+                state.recent.append((clue_id, guest[0], answer, correct))
+                state.pending.append({
+                    'game_instance_id': state.session_id,
+                    'guest_id': guest_id,
+                    'guest_name': guest[0],
+                    'clue_id': clue_id,
+                    'answer': answer,
+                    'correct': correct,
+                    'points': points,
+                    'submitted_at': datetime.now()
+                })
+                state.version += 1
+                pending = len(state.pending)
+
+        with self._lock:
+            if duplicate:
+                self.duplicates += 1
+            else:
+                self.accepted += 1
+        if not duplicate and pending >= self.max_pending:
+            session_store.request_flush()
+        return not duplicate
+
+    def _cached(self, state, key, build):
+        # Bodies are rebuilt at most once per change, so polling hosts read them in O(1)
+        with state.lock:
+            cached = state.bodies.get(key)
+            if cached is not None and cached[0] == state.version:
+                return cached[1]
+            body = json.dumps(build(state)).encode('utf-8')
+            state.bodies[key] = (state.version, body)
+            return body
+
+    def responses_body(self, session):
+        """JSON body of the open clue's tallies and most recent answers."""
+        with session.lock:
+            clue_id = session.open_clue
+
+        def build(state):
+            answers, correct, counts = state.tallies.get(clue_id, (0, 0, Counter()))
+            return {
+                'clue_id': str(clue_id) if clue_id is not None else None,
+                'count': answers,
+                'correct': correct,
+                'answers': [{'answer': text, 'count': count} for text, count in counts.most_common(10)],
+                'recent': [{
+                    'name': name,
+                    'answer': answer,
+                    'correct': is_correct
+                } for recent_clue, name, answer, is_correct in reversed(state.recent) if recent_clue == clue_id][:20]
+            }
+
+        return self._cached(self.state(session), ('responses', clue_id), build)
+
+    def scores_body(self, session):
+        """JSON body of guest scores, highest first."""
+        def build(state):
+            ranked = sorted(state.guests.items(), key=lambda item: (-item[1][1], item[1][0]))
+            return [{
+                'guest_id': guest_id,
+                'name': name,
+                'score': score,
+                'correct': correct
+            } for guest_id, (name, score, correct, _) in ranked]
+
+        return self._cached(self.state(session), 'scores', build)
+
+    def _insert(self, guests, rows):
+        if guests:
+            db.session.execute(insert(SessionGuest), guests)
+        if rows:
+            db.session.execute(insert(GuestAnswer), rows)
+        db.session.commit()
+
+    def _requeue(self, state, pending_guests, pending):
+        with state.lock:
+            state.pending_guests = pending_guests + state.pending_guests
+            state.pending = pending + state.pending
+
+    def _failed(self, state, pending_guests, pending, error):
+        """Requeue a session's rejected rows, or drop them once retrying cannot help."""
+        try:
+            gone = db.session.scalar(select(GameInstance.id).where(GameInstance.id == state.session_id)) is None
+        except Exception:
+            db.session.rollback()
+            gone = False
+        with state.lock:
+            state.flush_failures += 1
+            retry = not gone and state.flush_failures < self.max_retries
+        if retry:
+            self._requeue(state, pending_guests, pending)
+            return
+
+        print(f'Dropped {len(pending_guests)} guest joins and {len(pending)} answers '
+              f'of session {state.session_id}: {error.orig}')
+        with self._lock:
+            self.rows_dropped += len(pending_guests) + len(pending)
+        if gone:
+            # Deleted by another worker; forget it here too
+            self.discard([state.session_id])
+            session_store.discard([state.session_id])
+
+    def flush(self):
+        """Insert every pending join and answer in one transaction; used as a session flush hook.
+
+        If a row is rejected (say its session was deleted meanwhile), each
+        session is retried in its own transaction so the others still land.
+        A session whose rows keep being rejected has them dropped after
+        max_retries attempts, or at once if its GameInstance is gone.
+        """
+        with self._lock:
+            states = list(self._states.values())
+
+        taken = []
+        guests = []
+        rows = []
+        for state in states:
+            with state.lock:
+                if state.pending or state.pending_guests:
+                    taken.append((state, state.pending_guests, state.pending))
+                    guests.extend(state.pending_guests)
+                    rows.extend(state.pending)
+                    state.pending_guests = []
+                    state.pending = []
+
+        written = 0
+        try:
+            if guests or rows:
+                try:
+                    self._insert(guests, rows)
+                    written = len(rows)
+                    for state, _, _ in taken:
+                        state.flush_failures = 0
+                except (IntegrityError, DataError):
+                    db.session.rollback()
+                    for index, (state, pending_guests, pending) in enumerate(taken):
+                        try:
+                            self._insert(pending_guests, pending)
+                        except (IntegrityError, DataError) as e:
+                            db.session.rollback()
+                            self._failed(state, pending_guests, pending, e)
+                        except Exception:
+                            db.session.rollback()
+                            for item in taken[index:]:
+                                self._requeue(*item)
+                            raise
+                        else:
+                            written += len(pending)
+                            state.flush_failures = 0
+                except Exception:
+                    db.session.rollback()
+                    for item in taken:
+                        self._requeue(*item)
+                    raise
+        finally:
+            with self._lock:
+                self.rows_written += written
+
+        # Drop idle states with nothing left to write; they reload on demand
+        now = time.monotonic()
+        with self._lock:
+            for session_id, state in list(self._states.items()):
+                if not state.pending and not state.pending_guests and now - state.last_access > self.idle_ttl:
+                    del self._states[session_id]
+        return written
+
+    def discard(self, session_ids):
+        """Forget deleted sessions along with their unwritten joins and answers."""
+        with self._lock:
+            for session_id in session_ids:
+                self._states.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._states),
+                'accepted': self.accepted,
+                'duplicates': self.duplicates,
+                'rejected': self.rejected,
+                'rows_written': self.rows_written,
+                'rows_dropped': self.rows_dropped
+            }
+
+
+answer_store = AnswerStore(
+    window=float(os.environ.get('GUEST_ANSWER_WINDOW', 35)),
+    ring_size=int(os.environ.get('GUEST_ANSWER_RING_SIZE', 256)),
+    max_pending=int(os.environ.get('GUEST_ANSWER_MAX_PENDING', 1000)),
+    max_retries=int(os.environ.get('GUEST_ANSWER_MAX_RETRIES', 5))
+)
+session_store.add_flush_hook(answer_store.flush)
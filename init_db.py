@@ -1,10 +1,13 @@
-from app import app, db
-from models import Game, Category, Clue, Player, GameInstance
+from flask_migrate import upgrade
+from app import create_app
+from models import db, Game, Category, Clue, Player, GameInstance
+
+app = create_app({'MIGRATIONS_ENABLED': True})
 
 # This script initializes the database with tables
 with app.app_context():
-    # Create all tables
-    db.create_all()
+    # Create or upgrade all tables through the migrations
+    upgrade()
     print("Database tables created successfully!")
     
     # Check if we already have games
@@ -0,0 +1,210 @@
+"""
+Bulk importer for legacy data/games/*.json boards.
+
+Files are read, hashed, parsed and validated in a process pool and written
+with multi-row INSERTs, one transaction per chunk of files. Every imported
+file is recorded in legacy_imports under its name and content hash, in the
+same transaction as its board, so an interrupted run can simply be started
+again: unchanged files are skipped and changed files replace the board
+they were imported as.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import insert, select, update
+
+from boards import validate_board, insert_boards, insert_categories_many, clear_boards, BoardValidationError
+from models import db, Game, LegacyImport
+
+# Files handed to a worker per task, and files written per transaction
+IMPORT_TASK_SIZE = 64
+IMPORT_CHUNK_SIZE = 500
+
+
+def _parse_timestamp(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_legacy_file(path, file_name):
+    """Read and validate one legacy file; returns (file_name, hash, board, error)."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        return file_name, None, None, str(e)
+
+    content_hash = hashlib.sha256(raw).hexdigest()
+    try:
+        data = json.loads(raw)
+        # Normalizes types, e.g. the string clue values the old creator saved
+        board = validate_board(data)
+    except (ValueError, BoardValidationError) as e:
+        return file_name, content_hash, None, str(e)
+
+    board['created'] = _parse_timestamp(data.get('created'))
+    board['updated'] = _parse_timestamp(data.get('updated')) or board['created']
+    return file_name, content_hash, board, None
+
+
+def parse_legacy_files(jobs):
+    """Worker entry point: parse a list of (path, file_name) jobs."""
+    return [parse_legacy_file(path, file_name) for path, file_name in jobs]
+
+
+def scan_legacy_files(directory):
+    """List (path, file_name) for every *.json file in directory, sorted by name."""
+    with os.scandir(directory) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_file() and entry.name.endswith('.json'))
+    return [(os.path.join(directory, name), name) for name in names]
+
+
+def iter_parsed(jobs, workers):
+    """Yield parse results in file order, keeping a bounded number of tasks in flight."""
+    tasks = [jobs[start:start + IMPORT_TASK_SIZE] for start in range(0, len(jobs), IMPORT_TASK_SIZE)]
+
+    if workers <= 1:
+        for task in tasks:
+            yield from parse_legacy_files(task)
+        return
+
+    # Submitting everything up front would buffer every parsed board in memory
+    # whenever the database is slower than the parsers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(tasks)
+        in_flight = deque(pool.submit(parse_legacy_files, task) for task in islice(remaining, workers * 4))
+        while in_flight:
+            results = in_flight.popleft().result()
+            task = next(remaining, None)
+            if task is not None:
+                in_flight.append(pool.submit(parse_legacy_files, task))
+            yield from results
+
+
+def write_chunk(pending):
+    """Insert or replace the boards of one chunk and record them, in one transaction.
+
+    pending is a list of (file_name, content_hash, board, previous) where
+    previous is the file's existing LegacyImport row as (id, hash, game_id),
+    or None. Returns (inserted, replaced).
+    """
+    new_items = [item for item in pending if item[3] is None or item[3][2] is None]
+    replaced_items = [item for item in pending if item[3] is not None and item[3][2] is not None]
+
+    # Changed files: swap the board contents but keep the game id, so links and
+    # played sessions survive; bump updated so cached copies are dropped
+    if replaced_items:
+        game_ids = [previous[2] for _, _, _, previous in replaced_items]
+        clear_boards(game_ids)
+        now = datetime.now()
+        db.session.execute(update(Game), [{
+            'id': previous[2],
+            'title': board['title'],
+            'updated': now
+        } for _, _, board, previous in replaced_items])
+        insert_categories_many([(previous[2], board['categories']) for _, _, board, previous in replaced_items])
+
+    new_game_ids = insert_boards([board for _, _, board, _ in new_items])
+
+    records = [(item, item[3][2]) for item in replaced_items] + list(zip(new_items, new_game_ids))
+    created_records = [{
+        'file_name': file_name,
+        'content_hash': content_hash,
+        'game_id': game_id
+    } for (file_name, content_hash, _, previous), game_id in records if previous is None]
+    updated_records = [{
+        'id': previous[0],
+        'content_hash': content_hash,
+        'game_id': game_id,
+        'imported_at': datetime.now()
+    } for (file_name, content_hash, _, previous), game_id in records if previous is not None]
+
+    if created_records:
+        db.session.execute(insert(LegacyImport), created_records)
+    if updated_records:
+        db.session.execute(update(LegacyImport), updated_records)
+
+    db.session.commit()
+    return len(new_items), len(replaced_items)
+
+
+@click.command('import-legacy')
+@click.argument('directory', default='data/games', type=click.Path(exists=True, file_okay=False))
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='Parser processes; 1 parses inline.')
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help='Files written per transaction.')
+@click.option('--dry-run', is_flag=True, help='Parse and validate only; write nothing.')
+@with_appcontext
+def import_legacy_command(directory, workers, chunk_size, dry_run):
+    """Import legacy board JSON files from DIRECTORY (default data/games)."""
+    jobs = scan_legacy_files(directory)
+    known = {row.file_name: (row.id, row.content_hash, row.game_id) for row in db.session.execute(
+        select(LegacyImport.id, LegacyImport.file_name, LegacyImport.content_hash, LegacyImport.game_id)
+    )}
+    click.echo(f'Found {len(jobs)} files in {directory}; {len(known)} previously imported', err=True)
+
+    counts = {'processed': 0, 'imported': 0, 'replaced': 0, 'unchanged': 0, 'failed': 0}
+    failures = []
+    pending = []
+    start = last_report = time.monotonic()
+
+    def report():
+        elapsed = time.monotonic() - start
+        rate = counts['processed'] / elapsed if elapsed else 0
+        click.echo(f"{counts['processed']}/{len(jobs)} files ({rate:.0f}/s): {counts['imported']} imported, "
+                   f"{counts['replaced']} replaced, {counts['unchanged']} unchanged, {counts['failed']} failed", err=True)
+
+    def flush():
+        if not pending:
+            return
+        if dry_run:
+            replaced = sum(1 for item in pending if item[3] is not None and item[3][2] is not None)
+            inserted = len(pending) - replaced
+        else:
+            inserted, replaced = write_chunk(pending)
+        counts['imported'] += inserted
+        counts['replaced'] += replaced
+        pending.clear()
+
+    for file_name, content_hash, board, error in iter_parsed(jobs, workers):
+        counts['processed'] += 1
+        previous = known.get(file_name)
+
+        if error is not None:
+            counts['failed'] += 1
+            failures.append((file_name, error))
+        elif previous is not None and previous[1] == content_hash:
+            counts['unchanged'] += 1
+        else:
+            pending.append((file_name, content_hash, board, previous))
+            if len(pending) >= chunk_size:
+                flush()
+
+        if time.monotonic() - last_report >= 1:
+            report()
+            last_report = time.monotonic()
+
+    flush()
+    report()
+    if dry_run:
+        click.echo('Dry run: nothing was written', err=True)
+
+    # Failed files are not recorded, so the next run retries them
+    for file_name, error in failures[:20]:
+        click.echo(f'  {file_name}: {error}', err=True)
+    if len(failures) > 20:
+        click.echo(f'  ... and {len(failures) - 20} more', err=True)
+    if failures:
+        raise SystemExit(1)
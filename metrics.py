@@ -0,0 +1,192 @@
+"""
+Runtime instrumentation for GracefulTable Jeopardy.
+
+InstrumentedQueuePool times every connection checkout so pool saturation
+shows up as growing wait times and overflow use before it turns into
+request latency. The optional request middleware records wall time, SQL
+statement count and SQL time per request and per endpoint.
+"""
+
+import threading
+import time
+from collections import deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class PoolMetrics:
+    """Process-wide counters for connection pool activity."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait, overflowed):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._waits.append(wait)
+            if overflowed:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool):
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'wait_ms': {
+                    'avg': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                    'p95': round(percentile(waits, 95) * 1000, 3),
+                    'max': round(self.max_wait * 1000, 3)
+                }
+            }
+
+        # Live gauges come straight from the pool when it exposes them
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0)
+            })
+        stats['pool_class'] = type(pool).__name__
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait time and overflow usage."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+
+        pool_metrics.record_checkout(time.perf_counter() - start, self.checkedout() > self.size())
+        return connection
+
+
+def init_pool_metrics(engine):
+    """Count new and invalidated connections on an engine's pool."""
+    event.listen(engine, 'connect', lambda dbapi_connection, record: pool_metrics.record_connect())
+    event.listen(engine, 'invalidate', lambda dbapi_connection, record, exception: pool_metrics.record_invalidation())
+
+
+class RequestMetrics:
+    """Rolling per-endpoint samples of request wall time and SQL usage."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, endpoint, wall, queries, sql_time):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append((wall, queries, sql_time))
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        endpoints = {}
+        for endpoint, values in samples.items():
+            walls = sorted(sample[0] for sample in values)
+            endpoints[endpoint] = {
+                'requests': counts[endpoint],
+                'window': len(values),
+                'wall_ms': {
+                    'p50': round(percentile(walls, 50) * 1000, 3),
+                    'p95': round(percentile(walls, 95) * 1000, 3),
+                    'p99': round(percentile(walls, 99) * 1000, 3)
+                },
+                'avg_queries': round(sum(sample[1] for sample in values) / len(values), 2),
+                'avg_sql_ms': round(sum(sample[2] for sample in values) / len(values) * 1000, 3)
+            }
+        return endpoints
+
+
+request_metrics = RequestMetrics()
+
+
+def init_request_metrics(app, engine):
+    """Time every request and the SQL it runs, and report it in Server-Timing.
+
+    Statement timing uses the engine's before/after_cursor_execute events;
+    statements run outside a request (CLI commands, background flushes) are
+    ignored.
+    """
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_start'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_start', None)
+        if started is not None and has_request_context() and 'metrics_start' in g:
+            g.metrics_queries += 1
+            g.metrics_sql_time += time.perf_counter() - started
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_sql_time = 0.0
+
+    @app.after_request
+    def _record_request(response):
+        if 'metrics_start' not in g:
+            return response
+
+        wall = time.perf_counter() - g.metrics_start
+        request_metrics.record(request.endpoint or 'unmatched', wall, g.metrics_queries, g.metrics_sql_time)
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={wall * 1000:.2f}, db;dur={g.metrics_sql_time * 1000:.2f};desc="{g.metrics_queries} queries"'
+        )
+        return response
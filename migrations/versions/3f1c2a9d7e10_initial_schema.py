@@ -0,0 +1,86 @@
+"""initial schema
+
+Revision ID: 3f1c2a9d7e10
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7e10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by the old db.create_all() call already have these
+    # tables; only create the ones that are missing so they can be stamped.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'games' not in existing:
+        op.create_table(
+            'games',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('created', sa.DateTime(), nullable=True),
+            sa.Column('updated', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'categories' not in existing:
+        op.create_table(
+            'categories',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('game_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'game_instances' not in existing:
+        op.create_table(
+            'game_instances',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('game_id', sa.Integer(), nullable=False),
+            sa.Column('start_time', sa.DateTime(), nullable=True),
+            sa.Column('end_time', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'clues' not in existing:
+        op.create_table(
+            'clues',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.Column('answer', sa.Text(), nullable=False),
+            sa.Column('question', sa.Text(), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=True),
+            sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'players' not in existing:
+        op.create_table(
+            'players',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('game_instance_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('score', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['game_instance_id'], ['game_instances.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('players')
+    op.drop_table('clues')
+    op.drop_table('game_instances')
+    op.drop_table('categories')
+    op.drop_table('games')
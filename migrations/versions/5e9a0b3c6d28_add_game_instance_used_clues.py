@@ -0,0 +1,28 @@
+"""add per-session used clue bitset to game_instances
+
+Revision ID: 5e9a0b3c6d28
+Revises: c7d52e8a1f34
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9a0b3c6d28'
+down_revision = 'c7d52e8a1f34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.add_column(sa.Column('used_clues', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('clue_base', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.drop_column('clue_base')
+        batch_op.drop_column('used_clues')
@@ -0,0 +1,27 @@
+"""add games (created, id) index for keyset pagination
+
+Revision ID: 8b4e6d21c5a3
+Revises: 3f1c2a9d7e10
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d21c5a3'
+down_revision = '3f1c2a9d7e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have built the index from the model
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('games')}
+    if 'ix_games_created_id' not in existing:
+        op.create_index('ix_games_created_id', 'games', ['created', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_games_created_id', table_name='games')
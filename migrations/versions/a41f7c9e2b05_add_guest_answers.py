@@ -0,0 +1,39 @@
+"""add guest_answers table for guest answer ingestion
+
+Revision ID: a41f7c9e2b05
+Revises: 5e9a0b3c6d28
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f7c9e2b05'
+down_revision = '5e9a0b3c6d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'guest_answers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('game_instance_id', sa.Integer(), nullable=False),
+        sa.Column('guest_id', sa.String(length=64), nullable=False),
+        sa.Column('guest_name', sa.String(length=255), nullable=False),
+        sa.Column('clue_id', sa.Integer(), nullable=False),
+        sa.Column('answer', sa.Text(), nullable=False),
+        sa.Column('correct', sa.Boolean(), nullable=True),
+        sa.Column('points', sa.Integer(), nullable=True),
+        sa.Column('submitted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['game_instance_id'], ['game_instances.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_guest_answers_game_instance_id', 'guest_answers', ['game_instance_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_guest_answers_game_instance_id', table_name='guest_answers')
+    op.drop_table('guest_answers')
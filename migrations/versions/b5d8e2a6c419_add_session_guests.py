@@ -0,0 +1,42 @@
+"""add session_guests table so joined guests survive restarts
+
+Revision ID: b5d8e2a6c419
+Revises: f19a4c7b3d52
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d8e2a6c419'
+down_revision = 'f19a4c7b3d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'session_guests',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('game_instance_id', sa.Integer(), nullable=False),
+        sa.Column('guest_id', sa.String(length=64), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('joined_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['game_instance_id'], ['game_instances.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_session_guests_game_instance_id', 'session_guests', ['game_instance_id'], unique=False)
+
+    # Guests who already answered are known from their answers
+    op.execute(
+        'INSERT INTO session_guests (game_instance_id, guest_id, name, joined_at) '
+        'SELECT game_instance_id, guest_id, MIN(guest_name), MIN(submitted_at) FROM guest_answers '
+        'GROUP BY game_instance_id, guest_id'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_session_guests_game_instance_id', table_name='session_guests')
+    op.drop_table('session_guests')
@@ -0,0 +1,34 @@
+"""add legacy_imports table for the legacy board importer
+
+Revision ID: c7d52e8a1f34
+Revises: 8b4e6d21c5a3
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d52e8a1f34'
+down_revision = '8b4e6d21c5a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'legacy_imports',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('file_name', sa.String(length=512), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('game_id', sa.Integer(), nullable=True),
+        sa.Column('imported_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('file_name')
+    )
+
+
+def downgrade():
+    op.drop_table('legacy_imports')
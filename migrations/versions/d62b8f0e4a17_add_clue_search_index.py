@@ -0,0 +1,108 @@
+"""add full-text clue search index
+
+SQLite gets an FTS5 table, clue_search, and PostgreSQL a clues.search_vector
+tsvector column with a GIN index. Triggers keep either in sync with clues and
+category titles; existing clues are indexed here.
+
+Revision ID: d62b8f0e4a17
+Revises: a41f7c9e2b05
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd62b8f0e4a17'
+down_revision = 'a41f7c9e2b05'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copies of search.py's statements at this revision; a later change to
+# the index belongs in a new revision, not in an edit here
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE clue_search USING fts5(
+        answer, question, category,
+        tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER clues_search_insert AFTER INSERT ON clues BEGIN
+        INSERT INTO clue_search (rowid, answer, question, category)
+        SELECT new.id, new.answer, new.question, title FROM categories WHERE id = new.category_id;
+    END""",
+    """CREATE TRIGGER clues_search_update AFTER UPDATE OF answer, question, category_id ON clues BEGIN
+        DELETE FROM clue_search WHERE rowid = old.id;
+        INSERT INTO clue_search (rowid, answer, question, category)
+        SELECT new.id, new.answer, new.question, title FROM categories WHERE id = new.category_id;
+    END""",
+    """CREATE TRIGGER clues_search_delete AFTER DELETE ON clues BEGIN
+        DELETE FROM clue_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER categories_search_update AFTER UPDATE OF title ON categories BEGIN
+        UPDATE clue_search SET category = new.title
+        WHERE rowid IN (SELECT id FROM clues WHERE category_id = new.id);
+    END""",
+    """INSERT INTO clue_search (rowid, answer, question, category)
+       SELECT clues.id, clues.answer, clues.question, categories.title
+       FROM clues JOIN categories ON categories.id = clues.category_id""",
+    "INSERT INTO clue_search (clue_search) VALUES ('optimize')"
+]
+
+SQLITE_DOWNGRADE = [
+    'DROP TRIGGER IF EXISTS categories_search_update',
+    'DROP TRIGGER IF EXISTS clues_search_delete',
+    'DROP TRIGGER IF EXISTS clues_search_update',
+    'DROP TRIGGER IF EXISTS clues_search_insert',
+    'DROP TABLE IF EXISTS clue_search'
+]
+
+POSTGRES_UPGRADE = [
+    'ALTER TABLE clues ADD COLUMN search_vector tsvector',
+    """CREATE FUNCTION clues_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.answer, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.question, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT title FROM categories WHERE id = NEW.category_id), '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER clues_search_vector BEFORE INSERT OR UPDATE OF answer, question, category_id ON clues
+    FOR EACH ROW EXECUTE FUNCTION clues_search_vector()""",
+    """CREATE FUNCTION categories_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE clues SET answer = answer WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER categories_search_vector AFTER UPDATE OF title ON categories
+    FOR EACH ROW WHEN (OLD.title IS DISTINCT FROM NEW.title) EXECUTE FUNCTION categories_search_vector()""",
+    """UPDATE clues SET search_vector =
+        setweight(to_tsvector('english', coalesce(clues.answer, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(clues.question, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(categories.title, '')), 'B')
+    FROM categories WHERE categories.id = clues.category_id""",
+    'CREATE INDEX ix_clues_search_vector ON clues USING gin (search_vector)'
+]
+
+POSTGRES_DOWNGRADE = [
+    'DROP TRIGGER IF EXISTS categories_search_vector ON categories',
+    'DROP FUNCTION IF EXISTS categories_search_vector()',
+    'DROP TRIGGER IF EXISTS clues_search_vector ON clues',
+    'DROP FUNCTION IF EXISTS clues_search_vector()',
+    'DROP INDEX IF EXISTS ix_clues_search_vector',
+    'ALTER TABLE clues DROP COLUMN IF EXISTS search_vector'
+]
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for statement in POSTGRES_UPGRADE if postgres else SQLITE_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for statement in POSTGRES_DOWNGRADE if postgres else SQLITE_DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,39 @@
+"""add indexes on foreign keys and board lookup columns
+
+Revision ID: e83c1d5f9b26
+Revises: d62b8f0e4a17
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83c1d5f9b26'
+down_revision = 'd62b8f0e4a17'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_categories_game_id_position', 'categories', ['game_id', 'position']),
+    ('ix_clues_category_id_value', 'clues', ['category_id', 'value']),
+    ('ix_game_instances_game_id', 'game_instances', ['game_id']),
+    ('ix_players_game_instance_id', 'players', ['game_instance_id']),
+    ('ix_legacy_imports_game_id', 'legacy_imports', ['game_id'])
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # db.create_all() may already have built the index from the model
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
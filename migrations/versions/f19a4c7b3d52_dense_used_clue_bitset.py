@@ -0,0 +1,102 @@
+"""number used clue bits densely by board order instead of by clue id
+
+Revision ID: f19a4c7b3d52
+Revises: e83c1d5f9b26
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import struct
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19a4c7b3d52'
+down_revision = 'e83c1d5f9b26'
+branch_labels = None
+depends_on = None
+
+
+game_instances = sa.table(
+    'game_instances',
+    sa.column('id', sa.Integer),
+    sa.column('game_id', sa.Integer),
+    sa.column('used_clues', sa.LargeBinary),
+    sa.column('clue_base', sa.Integer),
+    sa.column('clue_order', sa.LargeBinary)
+)
+categories = sa.table('categories', sa.column('id', sa.Integer), sa.column('game_id', sa.Integer),
+                      sa.column('position', sa.Integer))
+clues = sa.table('clues', sa.column('id', sa.Integer), sa.column('category_id', sa.Integer),
+                 sa.column('value', sa.Integer))
+
+
+def bits(value):
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
+
+
+def to_bytes(value):
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def board_order(connection, game_id):
+    return connection.execute(
+        sa.select(clues.c.id).join(categories, clues.c.category_id == categories.c.id)
+        .where(categories.c.game_id == game_id)
+        .order_by(categories.c.position, categories.c.id, clues.c.value, clues.c.id)
+    ).scalars().all()
+
+
+def upgrade():
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.add_column(sa.Column('clue_order', sa.LargeBinary(), nullable=True))
+
+    # Re-number every session's used clues from (clue id - clue_base) to board order
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(game_instances.c.id, game_instances.c.game_id, game_instances.c.used_clues,
+                  game_instances.c.clue_base)
+    ).all()
+    for instance_id, game_id, used_clues, clue_base in rows:
+        order = board_order(connection, game_id)
+        positions = {clue_id: bit for bit, clue_id in enumerate(order)}
+        used = 0
+        for bit in bits(int.from_bytes(used_clues or b'', 'little')):
+            position = positions.get((clue_base or 0) + bit)
+            if position is not None:
+                used |= 1 << position
+        connection.execute(
+            game_instances.update().where(game_instances.c.id == instance_id)
+            .values(used_clues=to_bytes(used), clue_order=struct.pack(f'<{len(order)}I', *order))
+        )
+
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.drop_column('clue_base')
+
+
+def downgrade():
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.add_column(sa.Column('clue_base', sa.Integer(), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(game_instances.c.id, game_instances.c.used_clues, game_instances.c.clue_order)
+    ).all()
+    for instance_id, used_clues, clue_order in rows:
+        order = struct.unpack(f'<{len(clue_order or b"") // 4}I', clue_order or b'')
+        clue_base = min(order, default=0)
+        used = 0
+        for bit in bits(int.from_bytes(used_clues or b'', 'little')):
+            if bit < len(order):
+                used |= 1 << (order[bit] - clue_base)
+        connection.execute(
+            game_instances.update().where(game_instances.c.id == instance_id)
+            .values(used_clues=to_bytes(used), clue_base=clue_base)
+        )
+
+    with op.batch_alter_table('game_instances') as batch_op:
+        batch_op.drop_column('clue_order')
@@ -1,8 +1,7 @@
-from flask_migrate import Migrate
-from app import app, db
+from app import create_app
 
 # Setup Flask-Migrate
-migrate = Migrate(app, db)
+app = create_app({'MIGRATIONS_ENABLED': True})
 
 if __name__ == '__main__':
     # This script is used for migration commands
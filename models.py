@@ -6,6 +6,10 @@ db = SQLAlchemy()
 
 class Game(db.Model):
     __tablename__ = 'games'
+    __table_args__ = (
+        # Backs keyset pagination of the game list on (created, id)
+        db.Index('ix_games_created_id', 'created', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -13,7 +17,8 @@ class Game(db.Model):
     updated = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
     # Relationships
-    categories = db.relationship('Category', backref='game', cascade='all, delete-orphan')
+    categories = db.relationship('Category', backref='game', cascade='all, delete-orphan',
+                                 order_by='(Category.position, Category.id)')
     game_instances = db.relationship('GameInstance', backref='game')
     
     def to_dict(self):
@@ -27,6 +32,10 @@ class Game(db.Model):
 
 class Category(db.Model):
     __tablename__ = 'categories'
+    __table_args__ = (
+        # Backs loading a game's categories in board order and (id, game_id) lookups
+        db.Index('ix_categories_game_id_position', 'game_id', 'position'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('games.id'), nullable=False)
@@ -34,7 +43,8 @@ class Category(db.Model):
     position = db.Column(db.Integer, default=0)
     
     # Relationships
-    clues = db.relationship('Clue', backref='category', cascade='all, delete-orphan')
+    clues = db.relationship('Clue', backref='category', cascade='all, delete-orphan',
+                            order_by='(Clue.value, Clue.id)')
     
     def to_dict(self):
         return {
@@ -46,6 +56,10 @@ class Category(db.Model):
 
 class Clue(db.Model):
     __tablename__ = 'clues'
+    __table_args__ = (
+        # Backs loading a category's clues in value order
+        db.Index('ix_clues_category_id_value', 'category_id', 'value'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
@@ -67,7 +81,7 @@ class Player(db.Model):
     __tablename__ = 'players'
     
     id = db.Column(db.Integer, primary_key=True)
-    game_instance_id = db.Column(db.Integer, db.ForeignKey('game_instances.id'), nullable=False)
+    game_instance_id = db.Column(db.Integer, db.ForeignKey('game_instances.id'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
     score = db.Column(db.Integer, default=0)
     
@@ -82,9 +96,14 @@ class GameInstance(db.Model):
     __tablename__ = 'game_instances'
     
     id = db.Column(db.Integer, primary_key=True)
-    game_id = db.Column(db.Integer, db.ForeignKey('games.id'), nullable=False)
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id'), nullable=False, index=True)
     start_time = db.Column(db.DateTime, default=datetime.now)
     end_time = db.Column(db.DateTime)
+    # Clues played in this session, as a little-endian bitset where bit n is
+    # clue id clue_order[n]; the board's own clue rows are never written
+    used_clues = db.Column(db.LargeBinary)
+    # The session's clue ids in bit order, packed as little-endian uint32s
+    clue_order = db.Column(db.LargeBinary)
     
     # Relationships
     players = db.relationship('Player', backref='game_instance', cascade='all, delete-orphan')
@@ -97,3 +116,37 @@ class GameInstance(db.Model):
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'players': [player.to_dict() for player in self.players]
         }
+
+class GuestAnswer(db.Model):
+    __tablename__ = 'guest_answers'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    game_instance_id = db.Column(db.Integer, db.ForeignKey('game_instances.id'), nullable=False, index=True)
+    guest_id = db.Column(db.String(64), nullable=False)
+    guest_name = db.Column(db.String(255), nullable=False)
+    # Not a foreign key: answers are kept when a clue is later edited away
+    clue_id = db.Column(db.Integer, nullable=False)
+    answer = db.Column(db.Text, nullable=False)
+    correct = db.Column(db.Boolean, default=False)
+    points = db.Column(db.Integer, default=0)
+    submitted_at = db.Column(db.DateTime, default=datetime.now)
+
+# Guests who joined a session, so they survive a worker restart before answering
+class SessionGuest(db.Model):
+    __tablename__ = 'session_guests'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    game_instance_id = db.Column(db.Integer, db.ForeignKey('game_instances.id'), nullable=False, index=True)
+    guest_id = db.Column(db.String(64), nullable=False)
+    name = db.Column(db.String(255), nullable=False)
+    joined_at = db.Column(db.DateTime, default=datetime.now)
+
+# Which legacy data/games/*.json files have been imported, for resumable imports
+class LegacyImport(db.Model):
+    __tablename__ = 'legacy_imports'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    file_name = db.Column(db.String(512), nullable=False, unique=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id'), nullable=True, index=True)
+    imported_at = db.Column(db.DateTime, default=datetime.now)
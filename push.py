@@ -0,0 +1,158 @@
+"""
+Server-Sent Events fan-out for live game sessions.
+
+Each session with viewers has a Channel: a bounded log of encoded SSE
+messages with increasing sequence numbers. Publishing encodes a delta once,
+appends it and wakes the waiting streams; every viewer then reads the new
+messages from the shared log at its own cursor. Publishing therefore costs
+the same with one viewer or hundreds, and a slow viewer never makes the
+others wait or buffers messages of its own. A viewer that falls further
+behind than the log keeps is sent a 'resync' event and disconnected;
+EventSource reconnects and starts again from a fresh snapshot.
+
+Streams block a thread (or greenlet) each while they wait, so serve them
+with an async worker class, e.g. gunicorn -k gevent or -k gthread with
+many threads (see DEPLOYMENT.md).
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from itertools import islice
+
+
+def encode_event(event, data, event_id=None):
+    """Encode one SSE message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+HEARTBEAT = b': keepalive\n\n'
+
+
+class Channel:
+    __slots__ = ('seq', 'messages', 'cond', 'subscribers', 'closed')
+
+    def __init__(self, history):
+        self.seq = 0
+        self.messages = deque(maxlen=history)
+        self.cond = threading.Condition()
+        self.subscribers = 0
+        self.closed = False
+
+
+class Broker:
+    """Per-session pub/sub over shared, bounded message logs."""
+
+    def __init__(self, history=256, heartbeat=15.0):
+        self.history = history
+        self.heartbeat = heartbeat
+        self._channels = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.resyncs = 0
+
+    def publish(self, channel_id, deltas):
+        """Fan deltas out to the viewers of channel_id; a no-op without viewers.
+
+        A 'game_over' delta closes the channel: streams end after sending it.
+        """
+        with self._lock:
+            channel = self._channels.get(channel_id)
+        if channel is None or not deltas:
+            return
+
+        with channel.cond:
+            for delta in deltas:
+                channel.seq += 1
+                channel.messages.append(encode_event(delta['type'], delta, channel.seq))
+                if delta['type'] == 'game_over':
+                    channel.closed = True
+            channel.cond.notify_all()
+
+        with self._lock:
+            self.published += len(deltas)
+
+    def subscribe(self, channel_id):
+        """Register a viewer; returns (channel, cursor) for stream().
+
+        Subscribe before taking the snapshot sent to the viewer, so nothing
+        published in between is missed; deltas repeated from the snapshot
+        are harmless because they carry absolute values.
+        """
+        with self._lock:
+            channel = self._channels.get(channel_id)
+            if channel is None or channel.closed:
+                channel = self._channels[channel_id] = Channel(self.history)
+            channel.subscribers += 1
+        with channel.cond:
+            return channel, channel.seq
+
+    def _unsubscribe(self, channel_id, channel):
+        with self._lock:
+            channel.subscribers -= 1
+            if channel.subscribers == 0 and self._channels.get(channel_id) is channel:
+                del self._channels[channel_id]
+
+    def stream(self, channel_id, snapshot=None):
+        """Yield encoded SSE messages for one viewer until the game ends or the client goes away.
+
+        The viewer is subscribed when the stream is first iterated, not when
+        it is created, so a response that is dropped before its body starts
+        (the client disconnected first) never registers a subscriber that
+        nothing would remove. snapshot() is called right after subscribing
+        and its bytes are sent first.
+        """
+        channel, cursor = self.subscribe(channel_id)
+        try:
+            first = snapshot() if snapshot is not None else b''
+            if first:
+                yield first
+            while True:
+                with channel.cond:
+                    if channel.seq == cursor and not channel.closed:
+                        channel.cond.wait(self.heartbeat)
+                    seq = channel.seq
+                    oldest = seq - len(channel.messages) + 1
+                    closed = channel.closed
+                    if seq == cursor:
+                        batch = None
+                    elif cursor + 1 < oldest:
+                        batch = False
+                    else:
+                        batch = b''.join(islice(channel.messages, cursor + 1 - oldest, None))
+
+                if batch is None:
+                    if closed:
+                        return
+                    yield HEARTBEAT
+                elif batch is False:
+                    with self._lock:
+                        self.resyncs += 1
+                    yield encode_event('resync', {'reason': 'viewer fell behind'})
+                    return
+                else:
+                    yield batch
+                    cursor = seq
+        finally:
+            self._unsubscribe(channel_id, channel)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'channels': len(self._channels),
+                'viewers': sum(channel.subscribers for channel in self._channels.values()),
+                'published': self.published,
+                'resyncs': self.resyncs
+            }
+
+
+broker = Broker(
+    history=int(os.environ.get('PUSH_HISTORY', 256)),
+    heartbeat=float(os.environ.get('PUSH_HEARTBEAT', 15))
+)
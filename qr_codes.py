@@ -0,0 +1,179 @@
+"""
+Cached QR code rendering for session join links.
+
+Rendering a QR code with qrcode/PIL takes milliseconds of CPU, so images
+are content-addressed by a hash of (join URL, size) and kept in an LRU
+cache, optionally persisted to QR_CACHE_DIR so they survive restarts and
+are shared by workers. Cold renders run in a small thread pool: asking for
+a join link only computes the key and queues the render, and the image
+request waits for it if it is still in flight. Because a key always names
+the same bytes, images can be served as immutable.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import qrcode
+except ImportError:  # qrcode[pil] is optional; join links work without images
+    qrcode = None
+
+MIN_SIZE = 128
+MAX_SIZE = 1024
+DEFAULT_SIZE = 300
+
+
+def render_png(url, size):
+    """Render url as a size x size PNG."""
+    code = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=2)
+    code.add_data(url)
+    code.make(fit=True)
+    image = code.make_image(fill_color='black', back_color='white').get_image()
+    image = image.resize((size, size), resample=0)  # nearest neighbour keeps modules sharp
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def qr_key(url, size):
+    return hashlib.sha256(f'{size}:{url}'.encode('utf-8')).hexdigest()[:32]
+
+
+class QRCache:
+    def __init__(self, max_entries=512, directory=None, workers=2, renderer=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.renderer = renderer or render_png
+        self._images = OrderedDict()
+        # key -> (url, size), so an evicted image can be rendered again
+        self._params = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._workers = workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.renders = 0
+        self.evictions = 0
+
+    @property
+    def available(self):
+        return self.renderer is not render_png or qrcode is not None
+
+    def _executor(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='qr-render')
+        return self._pool
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.png')
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._images[key] = png
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+                self.evictions += 1
+
+    def _render(self, key, url, size):
+        try:
+            png = self.renderer(url, size)
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_path = f'{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(png)
+                os.replace(temp_path, self._path(key))
+            self._remember(key, png)
+            with self._lock:
+                self.renders += 1
+            return png
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _lookup(self, key):
+        with self._lock:
+            png = self._images.get(key)
+            if png is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return png
+
+        if self.directory:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    png = f.read()
+            except OSError:
+                return None
+            self._remember(key, png)
+            with self._lock:
+                self.disk_hits += 1
+            return png
+        return None
+
+    def prepare(self, url, size=DEFAULT_SIZE):
+        """Return the key for (url, size), queueing a render if it is not cached yet."""
+        key = qr_key(url, size)
+        with self._lock:
+            self._params[key] = (url, size)
+            self._params.move_to_end(key)
+            while len(self._params) > self.max_entries * 4:
+                self._params.popitem(last=False)
+            if key in self._images or key in self._inflight:
+                return key
+
+        if self.available and self._lookup(key) is None:
+            self._submit(key, url, size)
+        return key
+
+    def _submit(self, key, url, size):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = self._executor().submit(self._render, key, url, size)
+        return future
+
+    def get(self, key, timeout=10):
+        """Return PNG bytes for a key from prepare(), or None if the key is unknown."""
+        png = self._lookup(key)
+        if png is not None:
+            return png
+
+        with self._lock:
+            future = self._inflight.get(key)
+            params = self._params.get(key)
+        if future is None:
+            if params is None or not self.available:
+                return None
+            future = self._submit(key, *params)
+        return future.result(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'available': self.available,
+                'size': len(self._images),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'renders': self.renders,
+                'evictions': self.evictions,
+                'in_flight': len(self._inflight)
+            }
+
+
+qr_cache = QRCache(
+    max_entries=int(os.environ.get('QR_CACHE_SIZE', 512)),
+    directory=os.environ.get('QR_CACHE_DIR') or None,
+    workers=int(os.environ.get('QR_RENDER_THREADS', 2))
+)
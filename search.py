@@ -0,0 +1,238 @@
+"""
+Full-text clue search across all games.
+
+Clue text (answer and question) and the category title are indexed by the
+database itself: an FTS5 table, clue_search, on SQLite and a tsvector column,
+clues.search_vector, with a GIN index on PostgreSQL. Triggers keep the index
+in sync on every insert, update and delete of clues and on category renames,
+so add_clue, bulk saves, editor diffs and imports need no extra code. Both are
+created by the migrations; `flask rebuild-search-index` (re)creates them for
+databases made with create_all and repopulates them.
+
+Hits are ranked (BM25 / ts_rank_cd) and paginated with a (score, clue id)
+keyset cursor, and carry their category and game.
+"""
+
+import base64
+import json
+import re
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Terms beyond this are ignored; every term must match
+MAX_TERMS = 8
+
+# The migrations keep frozen copies of these; changing them needs a new revision
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE clue_search USING fts5(
+        answer, question, category,
+        tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER clues_search_insert AFTER INSERT ON clues BEGIN
+        INSERT INTO clue_search (rowid, answer, question, category)
+        SELECT new.id, new.answer, new.question, title FROM categories WHERE id = new.category_id;
+    END""",
+    """CREATE TRIGGER clues_search_update AFTER UPDATE OF answer, question, category_id ON clues BEGIN
+        DELETE FROM clue_search WHERE rowid = old.id;
+        INSERT INTO clue_search (rowid, answer, question, category)
+        SELECT new.id, new.answer, new.question, title FROM categories WHERE id = new.category_id;
+    END""",
+    """CREATE TRIGGER clues_search_delete AFTER DELETE ON clues BEGIN
+        DELETE FROM clue_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER categories_search_update AFTER UPDATE OF title ON categories BEGIN
+        UPDATE clue_search SET category = new.title
+        WHERE rowid IN (SELECT id FROM clues WHERE category_id = new.id);
+    END"""
+]
+
+SQLITE_POPULATE = [
+    'DELETE FROM clue_search',
+    """INSERT INTO clue_search (rowid, answer, question, category)
+       SELECT clues.id, clues.answer, clues.question, categories.title
+       FROM clues JOIN categories ON categories.id = clues.category_id""",
+    "INSERT INTO clue_search (clue_search) VALUES ('optimize')"
+]
+
+# Category titles weigh less than the clue's own text
+POSTGRES_VECTOR = """
+    setweight(to_tsvector('english', coalesce({clue}.answer, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({clue}.question, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({title}, '')), 'B')
+"""
+
+POSTGRES_INDEX = [
+    'ALTER TABLE clues ADD COLUMN search_vector tsvector',
+    """CREATE FUNCTION clues_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {vector};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""".format(vector=POSTGRES_VECTOR.format(
+        clue='NEW', title='(SELECT title FROM categories WHERE id = NEW.category_id)')),
+    """CREATE TRIGGER clues_search_vector BEFORE INSERT OR UPDATE OF answer, question, category_id ON clues
+    FOR EACH ROW EXECUTE FUNCTION clues_search_vector()""",
+    """CREATE FUNCTION categories_search_vector() RETURNS trigger AS $$
+    BEGIN
+        -- Touching the clue text fires clues_search_vector for each clue
+        UPDATE clues SET answer = answer WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER categories_search_vector AFTER UPDATE OF title ON categories
+    FOR EACH ROW WHEN (OLD.title IS DISTINCT FROM NEW.title) EXECUTE FUNCTION categories_search_vector()""",
+    'CREATE INDEX ix_clues_search_vector ON clues USING gin (search_vector)'
+]
+
+POSTGRES_POPULATE = [
+    """UPDATE clues SET search_vector = {vector}
+       FROM categories WHERE categories.id = clues.category_id""".format(
+        vector=POSTGRES_VECTOR.format(clue='clues', title='categories.title'))
+]
+
+# Ranked matches as (clue_id, score); a lower score is a better match
+SQLITE_HITS = """
+    SELECT rowid AS clue_id, bm25(clue_search, 1.0, 1.0, 0.5) AS score
+    FROM clue_search WHERE clue_search MATCH :query
+"""
+
+POSTGRES_HITS = """
+    SELECT clues.id AS clue_id, -ts_rank_cd(clues.search_vector, query)::float8 AS score
+    FROM clues, to_tsquery('english', :query) AS query
+    WHERE clues.search_vector @@ query
+"""
+
+# Rank and cut the page down before joining, so only the returned hits are looked up
+SEARCH_PAGE = """
+    SELECT hits.clue_id, hits.score, clues.value, clues.answer, clues.question,
+           categories.id AS category_id, categories.title AS category_title,
+           games.id AS game_id, games.title AS game_title
+    FROM (
+        SELECT clue_id, score FROM ({hits}) AS matches
+        {after}
+        ORDER BY score, clue_id
+        LIMIT :limit
+    ) AS hits
+    JOIN clues ON clues.id = hits.clue_id
+    JOIN categories ON categories.id = clues.category_id
+    JOIN games ON games.id = categories.game_id
+    ORDER BY hits.score, hits.clue_id
+"""
+
+
+MISSING_INDEX = 'Search index is missing; run flask db upgrade'
+
+
+class SearchUnavailable(RuntimeError):
+    """Raised when the database has no search index (migrations not applied)."""
+
+
+def search_terms(q):
+    """Split a user query into at most MAX_TERMS lowercase word terms."""
+    return _TOKEN.findall((q or '').lower())[:MAX_TERMS]
+
+
+def match_expression(dialect, terms):
+    """Build a MATCH / tsquery string; every term must match and the last one may be a prefix."""
+    if dialect == 'postgresql':
+        return ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+    # Quoting makes each term a plain string to FTS5 rather than query syntax
+    return ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+
+def encode_search_cursor(score, clue_id):
+    """Encode a (score, clue id) keyset position as an opaque URL-safe token."""
+    raw = json.dumps([score, clue_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_search_cursor(token):
+    """Decode a token from encode_search_cursor(); raises ValueError if malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        score, clue_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return float(score), int(clue_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f'Invalid cursor: {token}') from e
+
+
+def has_search_index(connection):
+    if connection.dialect.name == 'postgresql':
+        return any(column['name'] == 'search_vector' for column in inspect(connection).get_columns('clues'))
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clue_search'")
+    ).first() is not None
+
+
+def search_query(dialect, q, limit, cursor=None):
+    """Build the (statement, params) for one page of search_clues().
+
+    Raises ValueError for an empty query or a bad cursor.
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise ValueError('q must contain at least one word')
+
+    params = {'query': match_expression(dialect, terms), 'limit': limit + 1}
+    after = ''
+    if cursor is not None:
+        params['after_score'], params['after_id'] = decode_search_cursor(cursor)
+        after = 'WHERE score > :after_score OR (score = :after_score AND clue_id > :after_id)'
+
+    statement = text(SEARCH_PAGE.format(hits=POSTGRES_HITS if dialect == 'postgresql' else SQLITE_HITS,
+                                        after=after))
+    return statement, params
+
+
+def search_page(rows, limit):
+    """Split rows from search_query() into (hits, next_cursor)."""
+    # One extra row was fetched to learn whether another page exists
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_search_cursor(last.score, last.clue_id)
+
+
+def search_clues(q, limit, cursor=None):
+    """Return (hits, next_cursor) for one page of clues matching every term of q.
+
+    Raises ValueError for an empty query or a bad cursor and SearchUnavailable
+    when the index has not been created.
+    """
+    statement, params = search_query(db.engine.dialect.name, q, limit, cursor)
+    try:
+        rows = db.session.execute(statement, params).all()
+    except SQLAlchemyError:
+        db.session.rollback()
+        if not has_search_index(db.session.connection()):
+            raise SearchUnavailable(MISSING_INDEX)
+        raise
+    return search_page(rows, limit)
+
+
+def rebuild_search_index(connection):
+    """Create the search index if it is missing, then repopulate it from clues."""
+    postgres = connection.dialect.name == 'postgresql'
+    if not has_search_index(connection):
+        for statement in POSTGRES_INDEX if postgres else SQLITE_INDEX:
+            connection.execute(text(statement))
+    for statement in POSTGRES_POPULATE if postgres else SQLITE_POPULATE:
+        connection.execute(text(statement))
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Create (if needed) and repopulate the full-text clue search index."""
+    with db.engine.begin() as connection:
+        rebuild_search_index(connection)
+        count = connection.execute(text('SELECT count(*) FROM clues')).scalar()
+    click.echo(f'Indexed {count} clues')
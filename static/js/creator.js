@@ -42,64 +42,23 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         
         try {
-            // First, create the game
-            const gameTitle = document.getElementById('game-title').value;
-            
-            const gameResponse = await fetch('/api/games', {
+            // Create the game with all of its categories and clues in one request
+            const gameResponse = await fetch('/api/games/bulk', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ title: gameTitle })
+                body: JSON.stringify(collectBoard())
             });
             
             const gameData = await gameResponse.json();
             
-            if (!gameData.id) {
-                throw new Error('Failed to create game');
-            }
-            
-            // Then, add categories and clues
-            const gameId = gameData.id;
-            const categories = document.querySelectorAll('.category');
-            
-            for (const category of categories) {
-                const categoryTitle = category.querySelector('input[name^="categories"][name$="[title]"]').value;
-                
-                const categoryResponse = await fetch(`/api/games/${gameId}/categories`, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({ title: categoryTitle })
-                });
-                
-                const categoryData = await categoryResponse.json();
-                
-                if (!categoryData.id) {
-                    throw new Error('Failed to create category');
-                }
-                
-                const categoryId = categoryData.id;
-                const clues = category.querySelectorAll('.clue');
-                
-                for (const clue of clues) {
-                    const value = clue.querySelector('select[name^="categories"][name*="[clues]"][name$="[value]"]').value;
-                    const answer = clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[answer]"]').value;
-                    const question = clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[question]"]').value;
-                    
-                    await fetch(`/api/games/${gameId}/categories/${categoryId}/clues`, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({ value, answer, question })
-                    });
-                }
+            if (!gameResponse.ok || !gameData.id) {
+                throw new Error(gameData.error || 'Failed to create game');
             }
             
             // Redirect to the game page
-            window.location.href = `/game/${gameId}`;
+            window.location.href = `/game/${gameData.id}`;
         } catch (error) {
             console.error('Error creating game:', error);
             alert('Error creating game. Please try again later.');
@@ -148,6 +107,33 @@ document.addEventListener('DOMContentLoaded', () => {
         cluesContainer.appendChild(clueElement.querySelector('.clue'));
     }
     
+    // Function to read the form into the nested board shape used by the API
+    function collectBoard() {
+        const board = {
+            title: document.getElementById('game-title').value,
+            categories: []
+        };
+        
+        for (const category of document.querySelectorAll('.category')) {
+            const categoryData = {
+                title: category.querySelector('input[name^="categories"][name$="[title]"]').value,
+                clues: []
+            };
+            
+            for (const clue of category.querySelectorAll('.clue')) {
+                categoryData.clues.push({
+                    value: clue.querySelector('select[name^="categories"][name*="[clues]"][name$="[value]"]').value,
+                    answer: clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[answer]"]').value,
+                    question: clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[question]"]').value
+                });
+            }
+            
+            board.categories.push(categoryData);
+        }
+        
+        return board;
+    }
+    
     // Function to validate the form
     function validateForm() {
         // Check if game title is filled
@@ -12,6 +12,9 @@ document.addEventListener('DOMContentLoaded', () => {
     // Initialize category counter
     let categoryCounter = 0;
     
+    // Version of the game we loaded, sent back on save to detect concurrent edits
+    let loadedUpdated = null;
+    
     // If in edit mode, load the existing game data
     if (isEditMode && gameId) {
         pageTitle.textContent = 'Edit Jeopardy Game';
@@ -57,103 +60,52 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         
         try {
-            // Get the game title
-            const gameTitle = document.getElementById('game-title').value;
             let resultGameId;
             
             if (isEditMode) {
-                // Update the game title
-                await fetch(`/api/games/${gameId}`, {
+                // Send the whole board; the server applies only what changed in one transaction
+                const board = collectBoard();
+                board.updated = loadedUpdated;
+                
+                const response = await fetch(`/api/games/${gameId}`, {
                     method: 'PUT',
                     headers: {
                         'Content-Type': 'application/json'
                     },
-                    body: JSON.stringify({ title: gameTitle })
+                    body: JSON.stringify(board)
                 });
                 
-                resultGameId = gameId;
+                if (response.status === 409) {
+                    alert('This game was changed by someone else since you opened it. Reload the page to see the latest version.');
+                    return;
+                }
                 
-                // First delete all existing categories and clues
-                const existingCategories = await fetch(`/api/games/${gameId}/categories`).then(res => res.json());
+                const gameData = await response.json();
                 
-                for (const category of existingCategories) {
-                    await fetch(`/api/games/${gameId}/categories/${category.id}`, {
-                        method: 'DELETE'
-                    });
+                if (!response.ok) {
+                    throw new Error(gameData.error || 'Failed to update game');
                 }
+                
+                resultGameId = gameId;
             } else {
-                // Create a new game
-                const gameResponse = await fetch('/api/games', {
+                // Create the game with all of its categories and clues in one request
+                const gameResponse = await fetch('/api/games/bulk', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json'
                     },
-                    body: JSON.stringify({ title: gameTitle })
+                    body: JSON.stringify(collectBoard())
                 });
                 
                 const gameData = await gameResponse.json();
                 
-                if (!gameData.id) {
-                    throw new Error('Failed to create game');
+                if (!gameResponse.ok || !gameData.id) {
+                    throw new Error(gameData.error || 'Failed to create game');
                 }
                 
                 resultGameId = gameData.id;
             }
             
-            // Add categories and clues
-            const categories = document.querySelectorAll('.category');
-            
-            for (const category of categories) {
-                const categoryTitle = category.querySelector('input[name^="categories"][name$="[title]"]').value;
-                
-                const categoryResponse = await fetch(`/api/games/${resultGameId}/categories`, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({ title: categoryTitle })
-                });
-                
-                const categoryData = await categoryResponse.json();
-                
-                if (!categoryData.id) {
-                    throw new Error('Failed to create category');
-                }
-                
-                const categoryId = categoryData.id;
-                const clues = category.querySelectorAll('.clue');
-                
-                for (const clue of clues) {
-                    const value = clue.querySelector('select[name^="categories"][name*="[clues]"][name$="[value]"]').value;
-                    const answer = clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[answer]"]').value;
-                    const question = clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[question]"]').value;
-                    
-                    try {
-                        console.log(`Saving clue: ${value}, ${question.substring(0, 20)}... to category ${categoryId}`);
-                        const response = await fetch(`/api/games/${resultGameId}/categories/${categoryId}/clues`, {
-                            method: 'POST',
-                            headers: {
-                                'Content-Type': 'application/json'
-                            },
-                            body: JSON.stringify({ value, answer, question })
-                        });
-                        
-                        if (!response.ok) {
-                            const errorText = await response.text();
-                            console.error(`Error saving clue: ${errorText}`);
-                            throw new Error(`Failed to save clue: ${errorText}`);
-                        }
-                        
-                        const clueData = await response.json();
-                        console.log(`Clue saved successfully with ID: ${clueData.id}`);
-                    } catch (error) {
-                        console.error(`Error saving clue: ${error.message}`);
-                        alert(`Error saving clue: ${error.message}. Please try again.`);
-                        // Continue with other clues instead of breaking the entire save process
-                    }
-                }
-            }
-            
             // Show success message and redirect
             alert(isEditMode ? 'Game updated successfully!' : 'Game created successfully!');
             window.location.href = '/';
@@ -173,6 +125,7 @@ document.addEventListener('DOMContentLoaded', () => {
             
             // Set title
             document.getElementById('game-title').value = gameData.title;
+            loadedUpdated = gameData.updated;
             
             // Get categories
             const categoriesResponse = await fetch(`/api/games/${gameId}/categories`);
@@ -340,6 +293,35 @@ document.addEventListener('DOMContentLoaded', () => {
         cluesContainer.appendChild(clueElement.querySelector('.clue'));
     }
     
+    // Function to read the form into the nested board shape used by the API
+    function collectBoard() {
+        const board = {
+            title: document.getElementById('game-title').value,
+            categories: []
+        };
+        
+        for (const category of document.querySelectorAll('.category')) {
+            const categoryData = {
+                id: category.dataset.dbId,
+                title: category.querySelector('input[name^="categories"][name$="[title]"]').value,
+                clues: []
+            };
+            
+            for (const clue of category.querySelectorAll('.clue')) {
+                categoryData.clues.push({
+                    id: clue.dataset.dbId,
+                    value: clue.querySelector('select[name^="categories"][name*="[clues]"][name$="[value]"]').value,
+                    answer: clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[answer]"]').value,
+                    question: clue.querySelector('textarea[name^="categories"][name*="[clues]"][name$="[question]"]').value
+                });
+            }
+            
+            board.categories.push(categoryData);
+        }
+        
+        return board;
+    }
+    
     // Function to validate the form
     function validateForm() {
         // Check if game title is filled
@@ -8,6 +8,10 @@ document.addEventListener('DOMContentLoaded', () => {
     let timerInterval = null;
     let guestMode = true;
     
+    // Server-side session, remembered so a refresh can resume the game
+    let sessionId = null;
+    const sessionKey = `jeopardy-session-${gameId}`;
+    
     // DOM elements
     const gameTitle = document.getElementById('game-title');
     const setupScreen = document.getElementById('setup-screen');
@@ -85,6 +89,7 @@ document.addEventListener('DOMContentLoaded', () => {
             }
             
             gameTitle.textContent = gameData.title;
+            await resumeSession();
         } catch (error) {
             console.error('Error loading game:', error);
             alert('Error loading game. Redirecting to home page.');
@@ -94,8 +99,75 @@ document.addEventListener('DOMContentLoaded', () => {
  
     
     
+    // Resume a session started earlier in this browser, if it is still running
+    async function resumeSession() {
+        const storedId = localStorage.getItem(sessionKey);
+        if (!storedId) return;
+        
+        try {
+            const response = await fetch(`/api/sessions/${storedId}`);
+            const session = response.ok ? await response.json() : null;
+            
+            if (!session || session.ended || !confirm('Resume the game in progress?')) {
+                localStorage.removeItem(sessionKey);
+                return;
+            }
+            
+            sessionId = session.id;
+            players = session.players.map(player => ({ name: player.name, score: player.score }));
+            currentPlayer = session.current_player;
+            
+            const usedClues = new Set(session.used_clues);
+            for (const category of gameData.categories) {
+                for (const clue of category.clues) {
+                    clue.status = usedClues.has(clue.id) ? 'used' : 'unused';
+                }
+            }
+            
+            setupScreen.style.display = 'none';
+            gameBoard.style.display = 'block';
+            buildGameBoard();
+            updateScoreboard();
+        } catch (error) {
+            console.error('Error resuming session:', error);
+        }
+    }
+    
+    // Create the server-side session; the game still works locally if this fails
+    async function createSession() {
+        try {
+            const response = await fetch(`/api/games/${gameId}/sessions`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ players: players.map(player => player.name) })
+            });
+            
+            if (!response.ok) {
+                throw new Error(`Failed to create session: ${response.status}`);
+            }
+            
+            const session = await response.json();
+            sessionId = session.id;
+            localStorage.setItem(sessionKey, sessionId);
+        } catch (error) {
+            console.error('Error creating session:', error);
+        }
+    }
+    
+    // Record game events on the server; they are persisted in batches there
+    function sendSessionEvents(events) {
+        if (!sessionId) return;
+        
+        fetch(`/api/sessions/${sessionId}/events`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ events }),
+            keepalive: true
+        }).catch(error => console.error('Error sending session events:', error));
+    }
+    
     // Start the game
-    function startGame() {
+    async function startGame() {
         // Validate player names
         players = [];
         
@@ -122,6 +194,15 @@ document.addEventListener('DOMContentLoaded', () => {
             });
         }
         
+        // A new game starts from a fresh board
+        for (const category of gameData.categories) {
+            for (const clue of category.clues) {
+                clue.status = 'unused';
+            }
+        }
+        currentPlayer = 0;
+        await createSession();
+        
         // Hide setup screen, show game board
         setupScreen.style.display = 'none';
         gameBoard.style.display = 'block';
@@ -197,6 +278,7 @@ document.addEventListener('DOMContentLoaded', () => {
     function selectClue(categoryIndex, clue) {
         // Update the clue status to used
         clue.status = 'used';
+        sendSessionEvents([{ type: 'select_clue', clue_id: clue.id }]);
         
         // Get category title
         const categoryTitle = gameData.categories[categoryIndex].title;
@@ -257,6 +339,8 @@ document.addEventListener('DOMContentLoaded', () => {
             timerInterval = null;
         }
         
+        sendSessionEvents([{ type: 'reveal', clue_id: currentClue.id }]);
+        
         // Show answer display
         clueDisplay.style.display = 'none';
         answerDisplay.style.display = 'flex';
@@ -282,6 +366,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // Update player score
     function updateScore(points, playerIndex = currentPlayer) {
         players[playerIndex].score += parseInt(points);
+        sendSessionEvents([{ type: 'score', player_index: playerIndex, delta: parseInt(points) }]);
         updateScoreboard();
     }
    
@@ -296,6 +381,7 @@ document.addEventListener('DOMContentLoaded', () => {
         
         // Move to next player
         currentPlayer = (currentPlayer + 1) % players.length;
+        sendSessionEvents([{ type: 'turn', player_index: currentPlayer }]);
         updateScoreboard();
         
         // Check if all clues are used
@@ -305,6 +391,8 @@ document.addEventListener('DOMContentLoaded', () => {
         
         if (allUsed) {
             // Game over
+            sendSessionEvents([{ type: 'end' }]);
+            localStorage.removeItem(sessionKey);
             setTimeout(() => {
                 alert('Game Over! ' + getWinnerMessage());
                 window.location.href = '/';
@@ -34,15 +34,32 @@ async function checkDatabaseConnection() {
     }
 }
 
-async function loadGames() {
+// Number of games requested per page from /api/games
+const GAMES_PAGE_SIZE = 50;
+
+async function loadGames(cursor = null) {
     try {
-        const response = await fetch('/api/games');
+        const params = new URLSearchParams({ limit: GAMES_PAGE_SIZE });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        
+        const response = await fetch(`/api/games?${params}`);
         const games = await response.json();
+        const nextCursor = response.headers.get('X-Next-Cursor');
         
         const gamesList = document.getElementById('games-list');
-        gamesList.innerHTML = '';
         
-        if (games.length === 0) {
+        // Remove the previous "Load more" button, or the placeholder on the first page
+        const loadMoreButton = document.getElementById('load-more-games');
+        if (loadMoreButton) {
+            loadMoreButton.remove();
+        }
+        if (!cursor) {
+            gamesList.innerHTML = '';
+        }
+        
+        if (!cursor && games.length === 0) {
             gamesList.innerHTML = '<p>No games found. Create a new game to get started!</p>';
             return;
         }
@@ -91,6 +108,16 @@ async function loadGames() {
             
             gamesList.appendChild(gameCard);
         });
+        
+        // Offer the next page if the server reported one
+        if (nextCursor) {
+            const moreButton = document.createElement('button');
+            moreButton.id = 'load-more-games';
+            moreButton.className = 'btn secondary';
+            moreButton.textContent = 'Load more games';
+            moreButton.addEventListener('click', () => loadGames(nextCursor));
+            gamesList.appendChild(moreButton);
+        }
     } catch (error) {
         console.error('Error loading games:', error);
         document.getElementById('games-list').innerHTML = '<p>Error loading games. Please try again later.</p>';
@@ -146,7 +173,7 @@ async function deleteGame(gameId) {
             
             // If no games left, show message
             const gamesList = document.getElementById('games-list');
-            if (gamesList.children.length === 0) {
+            if (gamesList.querySelectorAll('.game-card').length === 0 && !document.getElementById('load-more-games')) {
                 gamesList.innerHTML = '<p>No games found. Create a new game to get started!</p>';
             }
         } else {
@@ -0,0 +1,71 @@
+// Guest page for /join/<session_id>: join with a name, then answer the open clue
+document.addEventListener('DOMContentLoaded', () => {
+    const joinForm = document.getElementById('join-form');
+    const answerForm = document.getElementById('answer-form');
+    const message = document.getElementById('join-message');
+    const storageKey = `jeopardy-guest-${SESSION_ID}`;
+
+    function showAnswerForm(guest) {
+        joinForm.hidden = true;
+        answerForm.hidden = false;
+        document.getElementById('guest-greeting').textContent = `Playing as ${guest.name}`;
+    }
+
+    // A guest who already joined from this browser keeps their id across reloads
+    let guest = JSON.parse(localStorage.getItem(storageKey) || 'null');
+    if (guest) {
+        showAnswerForm(guest);
+    }
+
+    joinForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        const name = document.getElementById('guest-name').value.trim();
+        try {
+            const response = await fetch(`/api/sessions/${encodeURIComponent(SESSION_ID)}/guests`, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({name})
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                message.textContent = data.error || 'Could not join the game';
+                return;
+            }
+            guest = {id: data.guest_id, name: data.name};
+            localStorage.setItem(storageKey, JSON.stringify(guest));
+            message.textContent = '';
+            showAnswerForm(guest);
+        } catch (error) {
+            console.error('Error joining game:', error);
+            message.textContent = 'Could not reach the game. Please try again.';
+        }
+    });
+
+    answerForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        const input = document.getElementById('guest-answer');
+        try {
+            const response = await fetch(`/api/sessions/${encodeURIComponent(SESSION_ID)}/answers`, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({guest_id: guest.id, answer: input.value})
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                if (response.status === 409 && (data.error || '').startsWith('Unknown guest')) {
+                    // The server no longer knows this guest; ask for a name again
+                    localStorage.removeItem(storageKey);
+                    answerForm.hidden = true;
+                    joinForm.hidden = false;
+                }
+                message.textContent = data.error || 'Answer not accepted';
+                return;
+            }
+            message.textContent = data.duplicate ? 'You already answered this clue' : 'Answer submitted';
+            input.value = '';
+        } catch (error) {
+            console.error('Error submitting answer:', error);
+            message.textContent = 'Could not reach the game. Please try again.';
+        }
+    });
+});
@@ -63,6 +63,15 @@ def verify_deployment(base_url):
                 else:
                     print(f"❌ Game retrieval - Failed ({game_response.status_code})")
                     all_successful = False
+
+                # Clean up so repeated verification runs don't accumulate test games
+                delete_response = requests.delete(game_url, timeout=5)
+
+                if delete_response.status_code == 200:
+                    print(f"✅ Game deletion - OK")
+                else:
+                    print(f"❌ Game deletion - Failed ({delete_response.status_code})")
+                    all_successful = False
             else:
                 print("❌ Game creation - Missing game ID in response")
                 all_successful = False
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Query count regression check for GracefulTable Jeopardy
+
+Loading a board must cost a fixed number of SQL statements however many
+categories and clues it has. This seeds boards of 1 and N categories,
+counts the statements run by load_board() plus Game.to_dict() and by an
+uncached GET /api/games/<id>, and fails if the counts differ between
+board sizes (an N+1 lazy load has crept back in):
+
+    python verify_query_counts.py
+    python verify_query_counts.py --categories 1,6,25 --database-url postgresql://localhost/jeopardy_counts
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+
+def make_board(title, categories, clues):
+    return {'title': title, 'categories': [{
+        'title': f'Category {c}',
+        'clues': [{'value': (v + 1) * 200, 'answer': f'Clue {c} {v}', 'question': f'What is {c} {v}?'}
+                  for v in range(clues)]
+    } for c in range(categories)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='empty database to seed (default: temporary SQLite file)')
+    parser.add_argument('--categories', default='1,6,25', help='comma-separated board sizes to compare')
+    parser.add_argument('--clues', type=int, default=5, help='clues per category')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-counts-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from sqlalchemy import event
+    from app import create_app
+    from boards import load_board
+    from cache import board_cache
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    sizes = [int(size) for size in args.categories.split(',') if size]
+    boards = {size: client.post('/api/games/bulk', json=make_board(f'Count check {size}', size, args.clues))
+              .get_json()['id'] for size in sizes}
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count(run):
+        del statements[:]
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                run()
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+        return len(statements)
+
+    def load_and_encode(game_id):
+        with app.app_context():
+            game = load_board(game_id)
+            assert len(game.to_dict()['categories']) == len(game.categories)
+
+    def get_uncached(game_id):
+        board_cache.invalidate(game_id)
+        assert client.get(f'/api/games/{game_id}').status_code == 200
+
+    failures = 0
+    for label, run in (('load_board + to_dict', load_and_encode), ('GET /api/games/<id>', get_uncached)):
+        counts = {size: count(lambda: run(game_id)) for size, game_id in boards.items()}
+        same = len(set(counts.values())) == 1
+        failures += 0 if same else 1
+        listed = ', '.join(f'{size} categories: {n}' for size, n in counts.items())
+        print(f"{'✅' if same else '❌'} {label}: {listed} statements")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Query plan regression check for GracefulTable Jeopardy
+
+Seeds a database, drives the hot API paths through the test client while
+recording every SQL statement they run, then EXPLAINs each one and fails
+if any plans a sequential scan of a table. Run it after changing queries,
+models or migrations:
+
+    python verify_query_plans.py
+    python verify_query_plans.py --database-url postgresql://localhost/jeopardy_plans
+
+SQLite is checked with EXPLAIN QUERY PLAN. PostgreSQL is checked with
+enable_seqscan off, so a Seq Scan in the plan means no usable index exists
+rather than that the seeded tables are small.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+# Statements that read a whole table on purpose
+ALLOWED = [
+    # Game list ETag and /api/status counts are whole-table aggregates
+    re.compile(r'^SELECT count\(', re.IGNORECASE)
+]
+
+GAMES = 20
+
+
+def seed(client):
+    """Create GAMES boards through the API and return their ids."""
+    game_ids = []
+    for g in range(GAMES):
+        game = client.post('/api/games/bulk', json={'title': f'Plan check {g}', 'categories': [{
+            'title': f'Category {g}-{c}',
+            'clues': [{'value': value, 'answer': f'Clue {g} {c} {value}', 'question': f'What is {value}?'}
+                      for value in (200, 400, 600, 800, 1000)]
+        } for c in range(6)]}).get_json()
+        game_ids.append(game['id'])
+    return game_ids
+
+
+def exercise(client, game_ids):
+    """Hit the hot read and write paths once each."""
+    game = client.get(f'/api/games/{game_ids[0]}').get_json()
+    category_id = game['categories'][0]['id']
+    clue_id = game['categories'][0]['clues'][0]['id']
+
+    client.get('/api/games?limit=5')
+    client.get(f'/api/games/{game_ids[1]}/categories')
+    client.get(f'/api/games/{game_ids[1]}/categories/{category_id}/clues')
+    client.post(f'/api/games/{game_ids[0]}/categories/{category_id}/clues',
+                json={'value': 1200, 'answer': 'Extra clue', 'question': 'What is extra?'})
+    client.get('/api/search?q=clue')
+
+    session = client.post(f'/api/games/{game_ids[0]}/sessions', json={'players': ['A', 'B']}).get_json()
+    client.post(f"/api/sessions/{session['id']}/events", json={'type': 'select_clue', 'clue_id': clue_id})
+    client.post(f"/api/sessions/{session['id']}/guests", json={'name': 'Guest'})
+
+    # Write the session out and drop it from memory so the next read reloads it
+    from game_sessions import session_store
+    session_store._flush_all()
+    session_store._sessions.clear()
+    client.get(f"/api/sessions/{session['id']}")
+
+    client.delete(f'/api/games/{game_ids[2]}/categories/{category_id}')
+    client.delete(f'/api/games/{game_ids[0]}')
+    client.post('/api/games/batch-delete', json={'ids': game_ids[3:5]})
+
+
+def explain(connection, statement, parameters):
+    """Return (full_scans, plan_lines) for one statement."""
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql('SET enable_seqscan = off')
+        plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes = []
+
+        def walk(node, depth):
+            nodes.append(('  ' * depth) + node['Node Type'] + (f" on {node['Relation Name']}"
+                                                               if 'Relation Name' in node else ''))
+            for child in node.get('Plans', []):
+                walk(child, depth + 1)
+
+        walk(plan[0]['Plan'], 0)
+        return [line.strip() for line in nodes if line.strip().startswith('Seq Scan')], nodes
+
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    lines = [row[-1] for row in rows]
+    # Subqueries SQLite builds itself are scanned too, but they are not tables
+    derived = {line.split()[-1] for line in lines if line.startswith(('MATERIALIZE ', 'CO-ROUTINE '))}
+    # "SCAN t USING [COVERING] INDEX" walks an index in order; bare "SCAN t" reads the table
+    scans = [line for line in lines if line.startswith('SCAN ') and 'USING' not in line
+             and 'VIRTUAL TABLE' not in line and line.split()[1] not in derived | {'CONSTANT'}]
+    return scans, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='empty database to seed (default: temporary SQLite file)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every plan')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(prefix='jeopardy-plans-', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from sqlalchemy import event
+    from app import create_app
+    from models import db
+    from search import rebuild_search_index
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            rebuild_search_index(connection)
+
+    client = app.test_client()
+    game_ids = seed(client)
+
+    # Record each distinct statement the hot paths run, with one set of parameters
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0] if parameters else None
+        if re.match(r'\s*(SELECT|UPDATE|DELETE)\b', statement, re.IGNORECASE):
+            statements.setdefault(statement, parameters)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        exercise(client, game_ids)
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    failures = 0
+    with app.app_context():
+        with db.engine.connect() as connection:
+            for statement, parameters in statements.items():
+                one_line = ' '.join(statement.split())
+                if any(pattern.match(one_line) for pattern in ALLOWED):
+                    continue
+                scans, lines = explain(connection, statement, parameters)
+                if scans:
+                    failures += 1
+                    print(f"❌ {one_line[:160]}")
+                    for line in lines:
+                        print(f"      {line}")
+                elif args.verbose:
+                    print(f"✅ {one_line[:160]}")
+                    for line in lines:
+                        print(f"      {line}")
+            connection.rollback()
+
+    print(f"\nChecked {len(statements)} statements: {failures} with sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())